@@ -0,0 +1,154 @@
+"""
+Scatter plots that stay responsive with hundreds of thousands of shots.
+
+``scatter_figure`` wraps ``px.scatter``: above ``MAX_SCATTER_POINTS`` shots
+the points are thinned on the server with ``thin_scatter`` before they are
+serialized, and above ``WEBGL_THRESHOLD`` plotted points the figure is drawn
+with WebGL (``scattergl``) instead of SVG. Thinning works on a per-club grid:
+sparse cells, where outliers live, keep every point and only dense cells are
+sampled down, so the payload is bounded without hiding unusual shots.
+
+Per-club OLS trendlines come from ``fit_trendlines``, which fits every club
+at once from grouped sums (n, Σx, Σy, Σx², Σxy, Σy²) over all shots, not
+just the plotted ones, and are drawn as line overlays.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Plotted points above which the browser renders with WebGL
+WEBGL_THRESHOLD = int(os.environ.get('GOLF_WEBGL_THRESHOLD', 2000))
+# Most points serialized per scatter plot
+MAX_SCATTER_POINTS = int(os.environ.get('GOLF_MAX_SCATTER_POINTS', 20000))
+
+
+def thin_scatter(df, x, y, max_points=MAX_SCATTER_POINTS, group='Club Name', seed=0):
+    """Return at most ``max_points`` rows of ``df`` that keep the shape of a scatter
+
+    Points are binned on a grid per ``group`` and every cell keeps up to the
+    same number of points, chosen at random; that cap is the largest one
+    that fits the budget. The grid has at most ``max_points / 2`` cells, so
+    every non-empty cell keeps at least one point. Rows stay in their
+    original order.
+    """
+    if len(df) <= max_points:
+        return df
+
+    xs = pd.to_numeric(df[x], errors='coerce').to_numpy(dtype=float)
+    ys = pd.to_numeric(df[y], errors='coerce').to_numpy(dtype=float)
+    valid = np.flatnonzero(~np.isnan(xs) & ~np.isnan(ys))
+    if len(valid) == 0:
+        return df.iloc[:0]
+    if group in df.columns:
+        groups = pd.factorize(df[group].to_numpy()[valid], use_na_sentinel=False)[0]
+    else:
+        groups = np.zeros(len(valid), dtype=np.int64)
+    n_groups = max(groups.max(initial=0) + 1, 1)
+
+    bins = max(int(np.sqrt(max_points / (2 * n_groups))), 1)
+    cells = groups * bins * bins + _bin(xs[valid], bins) * bins + _bin(ys[valid], bins)
+
+    # Largest per-cell cap whose total fits the budget
+    counts = np.sort(np.bincount(cells))
+    counts = counts[counts > 0]
+    below = np.concatenate([[0], np.cumsum(counts)])
+    caps = np.arange(1, counts[-1] + 1)
+    n_below = np.searchsorted(counts, caps, side='left')
+    totals = below[n_below] + caps * (len(counts) - n_below)
+    cap = caps[max(np.searchsorted(totals, max_points, side='right') - 1, 0)]
+
+    # Random rank of each point within its cell
+    keys = np.random.default_rng(seed).random(len(cells))
+    order = np.lexsort((keys, cells))
+    sorted_cells = cells[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    ranks = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+
+    kept = np.sort(valid[order[ranks < cap]])
+    return df.iloc[kept]
+
+
+def _bin(values, bins):
+    """Equal-width bin index of each value"""
+    low, high = values.min(), values.max()
+    if high <= low:
+        return np.zeros(len(values), dtype=np.int64)
+    return np.minimum(((values - low) / (high - low) * bins).astype(np.int64), bins - 1)
+
+
+def fit_trendlines(df, x, y, group='Club Name'):
+    """Ordinary least squares fit of ``y`` on ``x`` for every group at once
+
+    Returns one row per group with the number of points ``n``, ``slope``,
+    ``intercept``, ``r2`` and the ``x_min``/``x_max`` the line spans.
+    Groups with fewer than two distinct x values get NaN coefficients.
+    """
+    xs = pd.to_numeric(df[x], errors='coerce').astype(float)
+    ys = pd.to_numeric(df[y], errors='coerce').astype(float)
+    valid = xs.notna() & ys.notna()
+    xs, ys = xs[valid], ys[valid]
+
+    keys = df.loc[valid, group]
+    totals = pd.DataFrame({
+        'n': 1.0, 'sx': xs, 'sy': ys, 'sxx': xs * xs, 'sxy': xs * ys, 'syy': ys * ys,
+    }).groupby(keys, observed=True).sum()
+    bounds = xs.groupby(keys, observed=True).agg(['min', 'max'])
+    n, sx, sy = totals['n'], totals['sx'], totals['sy']
+
+    # Centered sums of squares and cross products
+    sxx = totals['sxx'] - sx * sx / n
+    sxy = totals['sxy'] - sx * sy / n
+    syy = totals['syy'] - sy * sy / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = sxy / sxx.where(sxx > 0)
+        r2 = sxy * sxy / (sxx * syy).where(syy > 0)
+    r2 = r2.where(syy > 0, 1.0).where(slope.notna())
+
+    return pd.DataFrame({
+        'n': n.astype('int64'),
+        'slope': slope,
+        'intercept': (sy - slope * sx) / n,
+        'r2': r2,
+        'x_min': bounds['min'],
+        'x_max': bounds['max'],
+    })
+
+
+def add_trendlines(fig, trendlines, x, y):
+    """Overlay fitted lines on a scatter figure, colored like their group"""
+    colors = {trace.name: trace.marker.color for trace in fig.data}
+    line_type = go.Scattergl if any(trace.type == 'scattergl' for trace in fig.data) else go.Scatter
+
+    for name, fit in trendlines.dropna(subset=['slope']).iterrows():
+        xs = [fit['x_min'], fit['x_max']]
+        fig.add_trace(line_type(
+            x=xs, y=[fit['intercept'] + fit['slope'] * value for value in xs],
+            mode='lines', name=str(name), legendgroup=str(name), showlegend=False,
+            line={'color': colors.get(str(name))},
+            hovertemplate=(
+                f"<b>OLS trendline</b><br>{y} = {fit['slope']:.4g} * {x} + {fit['intercept']:.4g}"
+                f"<br>R<sup>2</sup>={fit['r2']:.4f}<extra>{name}</extra>"
+            ),
+        ))
+    return fig
+
+
+def scatter_figure(df, x, y, title, max_points=MAX_SCATTER_POINTS,
+                   webgl_threshold=WEBGL_THRESHOLD, trendlines=None, **kwargs):
+    """``px.scatter`` with server-side thinning and WebGL for large data
+
+    ``trendlines`` is a ``fit_trendlines`` frame to overlay. Extra keyword
+    arguments are passed to ``px.scatter``.
+    """
+    shown = thin_scatter(df, x, y, max_points, group=kwargs.get('color', 'Club Name'))
+    if len(shown) < len(df):
+        title = f"{title} ({len(shown):,} of {len(df):,} shots shown)"
+
+    render_mode = 'webgl' if len(shown) > webgl_threshold else 'svg'
+    fig = px.scatter(shown, x=x, y=y, title=title, render_mode=render_mode, **kwargs)
+    if trendlines is not None:
+        add_trendlines(fig, trendlines, x, y)
+    return fig
@@ -0,0 +1,62 @@
+"""
+Cleaning of raw launch monitor session data.
+
+Shared by the dashboard and the ingest layer so session files can be cleaned
+one file or one chunk at a time, outside of a Streamlit script.
+"""
+import pandas as pd
+
+from clubs import normalize_club_names
+from imputation import impute_missing_metrics
+from units import parse_metric_column
+
+
+def clean_and_process_data(df, impute_missing=False):
+    """Clean and process the combined golf data
+
+    With ``impute_missing`` the club and face metrics the launch monitor did
+    not capture are filled with estimates (see ``imputation``).
+    """
+    if df.empty:
+        return df
+
+    # Normalize club names (once per distinct raw name) to the ordered club categorical
+    df['Club Name'] = normalize_club_names(df['Club Name'])
+
+    # Convert date column
+    if 'Shot Created Date' in df.columns:
+        df['Shot Created Date'] = pd.to_datetime(df['Shot Created Date'], errors='coerce')
+        df['Date'] = df['Shot Created Date'].dt.date
+
+    # Ensure numeric columns
+    numeric_cols = [
+        'Ball Speed (mph)', 'Push/Pull (deg L-/R+)', 'Launch Angle (deg)',
+        'Back Spin (rpm)', 'Side Spin (rpm L-/R+)', 'Total Spin (rpm)',
+        'Carry (yds)', 'Total Distance (yds)', 'Offline (yds L-/R+)',
+        'Peak Height (yds)', 'Descent Angle (deg)'
+    ]
+
+    # Text values such as '123 mph' or '4.6° R' keep their number and direction
+    for col in numeric_cols:
+        if col in df.columns:
+            df[col] = parse_metric_column(df[col])
+
+    # Filter to valid clubs (names outside the club categories are NaN)
+    df = df[df['Club Name'].notna()]
+
+    # Remove rows with missing critical data
+    df = df.dropna(subset=['Ball Speed (mph)', 'Carry (yds)'])
+
+    if impute_missing:
+        df, _ = impute_missing_metrics(df)
+
+    return add_derived_columns(df)
+
+
+def add_derived_columns(df):
+    """Add roll (total minus carry) and spin efficiency (back / (back + |side|))"""
+    if 'Total Distance (yds)' in df.columns and 'Carry (yds)' in df.columns:
+        df['Roll'] = df['Total Distance (yds)'] - df['Carry (yds)']
+    if 'Back Spin (rpm)' in df.columns and 'Side Spin (rpm L-/R+)' in df.columns:
+        df['Spin_Efficiency'] = df['Back Spin (rpm)'] / (df['Back Spin (rpm)'] + df['Side Spin (rpm L-/R+)'].abs())
+    return df
@@ -0,0 +1,61 @@
+"""
+Shared club name normalization.
+
+Launch monitor exports spell clubs many ways ('Driver', 'dr', '5 iron5i',
+'gap wdge'). ``normalize_club_names`` maps them onto one fixed, ordered
+``Categorical`` of clubs, doing the string cleanup and lookup once per
+distinct raw value instead of once per shot. Unknown names become NaN.
+"""
+import numpy as np
+import pandas as pd
+
+# Longest to shortest club; also the display order of every by-club chart
+CLUB_ORDER = ['Dr', '3w', '5w', '3h', '4h', '5h', '3i', '4i', '5i', '6i', '7i', '8i', '9i', 'PW', 'GW', 'SW', 'LW']
+
+CLUB_DTYPE = pd.CategoricalDtype(CLUB_ORDER, ordered=True)
+
+# Keys are stripped, lower-cased raw names
+CLUB_NAME_MAP = {
+    'driver': 'Dr', 'dr': 'Dr',
+    '3 wood': '3w', '3w': '3w', 'fw': '3w',
+    '5 wood': '5w', '5w': '5w',
+    '3 hybrid': '3h', '3h': '3h',
+    '4 hybrid': '4h', '4h': '4h',
+    '5 hybrid': '5h', '5h': '5h',
+    '3 iron': '3i', '3i': '3i',
+    '4 iron': '4i', '4i': '4i',
+    '5 iron': '5i', '5i': '5i', '5 iron5i': '5i',
+    '6 iron': '6i', '6i': '6i',
+    '7 iron': '7i', '7i': '7i',
+    '8 iron': '8i', '8i': '8i',
+    '9 iron': '9i', '9i': '9i',
+    'pitching wedge': 'PW', 'pw': 'PW',
+    'gap wedge': 'GW', 'gw': 'GW', 'gap wdge': 'GW',
+    'sand wedge': 'SW', 'sw': 'SW',
+    'lob wedge': 'LW', 'lw': 'LW',
+    'wedge': 'SW', 'swedge': 'SW'  # catch-all for generic "wedge"
+}
+
+
+def normalize_club_names(names):
+    """Map raw club names to the ordered club categorical
+
+    Returns a categorical Series aligned with ``names``; names that do not
+    map to a known club are NaN.
+    """
+    names = pd.Series(names)
+    codes, uniques = pd.factorize(names)
+
+    keys = pd.Index(uniques).astype(str).str.strip().str.lower()
+    unique_codes = pd.Categorical(keys.map(CLUB_NAME_MAP), dtype=CLUB_DTYPE).codes
+
+    # factorize marks missing names with -1, which picks the trailing -1
+    club_codes = np.append(unique_codes, -1)[codes]
+    return pd.Series(pd.Categorical.from_codes(club_codes, dtype=CLUB_DTYPE),
+                     index=names.index, name=names.name)
+
+
+def sort_clubs(clubs):
+    """Sort club names in bag order, unknown names last"""
+    rank = {club: i for i, club in enumerate(CLUB_ORDER)}
+    return sorted(clubs, key=lambda club: (rank.get(club, len(rank)), str(club)))
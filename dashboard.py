@@ -1,16 +1,28 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
 import os
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+# Plotting and export modules and the session ingest are imported where
+# they are used, so they do not delay the first paint
+import rollups
+from clubs import sort_clubs
+from figure_cache import cache_stats, cached_figure, clear_figure_cache
+from shot_index import SORT_COLUMNS, filter_shots, select_positions, sorted_positions
+from shot_schema import display_shots, memory_report
+import shared_data
+import snapshot
+
+# Keep the resident DataFrame in compact dtypes (float32/int16, categoricals)
+COMPACT_SCHEMA = os.environ.get('GOLF_COMPACT_SCHEMA', '1') != '0'
+
+# Rows per page of the raw shot table
+PAGE_SIZES = [50, 100, 500, 1000]
+
+# Start from the prebuilt snapshot (python snapshot.py build) when it is current
+USE_SNAPSHOT = os.environ.get('GOLF_USE_SNAPSHOT', '1') != '0'
+
 # Set page config
 st.set_page_config(
     page_title="Golf Performance Analytics",
@@ -44,109 +56,337 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def describe_store():
+    """Summary of the shot store, tagged with its data version"""
+    import shot_store
+    summary = shot_store.describe_store()
+    summary['version'] = rollups.data_version()
+    return summary
+
 @st.cache_data
 def load_all_session_data():
-    """Load and combine all CSV files from the sessions folder"""
+    """Summarize the shot data, ingesting new or changed session CSVs
+    
+    When the prebuilt snapshot still matches the sessions folder its summary
+    is used as is and nothing is ingested.
+    """
     sessions_dir = './sessions'
-    dataframes = []
     
     if not os.path.exists(sessions_dir):
         st.error(f"Sessions directory '{sessions_dir}' not found!")
-        return pd.DataFrame()
+        return describe_store()
     
     csv_files = [f for f in os.listdir(sessions_dir) if f.endswith('.csv')]
     
     if not csv_files:
         st.error("No CSV files found in sessions directory!")
-        return pd.DataFrame()
-    
-    for filename in csv_files:
-        try:
-            file_path = os.path.join(sessions_dir, filename)
-            df = pd.read_csv(file_path)
-            df['Session_File'] = filename
-            dataframes.append(df)
-        except Exception as e:
-            st.warning(f"Could not load {filename}: {str(e)}")
-    
-    if not dataframes:
-        return pd.DataFrame()
-    
-    combined_df = pd.concat(dataframes, ignore_index=True)
-    return clean_and_process_data(combined_df)
+        return describe_store()
+    
+    meta = snapshot.current_snapshot(sessions_dir, compact=COMPACT_SCHEMA) if USE_SNAPSHOT else None
+    if meta is not None:
+        report = {'errors': meta['errors']}
+        summary = dict(meta['summary'], version=meta['version'])
+    else:
+        from ingest import ingest_sessions
+        report = ingest_sessions(sessions_dir)
+        summary = describe_store()
+    
+    for filename, error in report['errors'].items():
+        st.warning(f"Could not load {filename}: {error}")
+    
+    return summary
 
-def clean_and_process_data(df):
-    """Clean and process the combined golf data"""
-    if df.empty:
-        return df
-    
-    # Normalize club names
-    df['Club Name'] = df['Club Name'].astype(str).str.strip().str.lower()
-    
-    club_name_map = {
-        'driver': 'Dr', 'dr': 'Dr',
-        '3 wood': '3w', '3w': '3w', 'fw': '3w',
-        '5 wood': '5w', '5w': '5w',
-        '3 hybrid': '3h', '3h': '3h',
-        '4 hybrid': '4h', '4h': '4h',
-        '5 hybrid': '5h', '5h': '5h',
-        '3 iron': '3i', '3i': '3i',
-        '4 iron': '4i', '4i': '4i',
-        '5 iron': '5i', '5i': '5i', '5 iron5i': '5i',
-        '6 iron': '6i', '6i': '6i',
-        '7 iron': '7i', '7i': '7i',
-        '8 iron': '8i', '8i': '8i', '8 iron': '8i',
-        '9 iron': '9i', '9i': '9i', '9 iron': '9i',
-        'pitching wedge': 'PW', 'pw': 'PW',
-        'gap wedge': 'GW', 'gw': 'GW', 'gap wdge': 'GW',
-        'sand wedge': 'SW', 'sw': 'SW',
-        'lob wedge': 'LW', 'lw': 'LW',
-        'wedge': 'SW'
-    }
+@st.cache_resource(max_entries=1)
+def load_dataset(data_version):
+    """Shots, filter index and rollups of a data version
+    
+    Built once per data version and process and shared, unmodified, by
+    every session and rerun; nothing is pickled or copied per session.
+    """
+    return shared_data.load_dataset(data_version, compact=COMPACT_SCHEMA)
+
+@st.cache_data
+def load_trendlines(data_version, date_range, clubs, speed_range, x, y):
+    """Per-club OLS trendlines of a scatter over all filtered shots"""
+    from charts import fit_trendlines
+    df = filter_shots(load_dataset(data_version)['index'], date_range, clubs, speed_range)
+    return fit_trendlines(df, x, y)
+
+def create_performance_metrics(df, dataset, date_filter, club_filter, speed_filter):
+    """Calculate key performance metrics
+    
+    Date and club filters select whole rollup groups; a ball speed filter
+    cuts through them, so the filtered shots are rolled up instead.
+    """
+    if speed_filter is None:
+        shot_rollups = rollups.select_rollups(dataset['rollups'], date_filter, club_filter)
+    else:
+        shot_rollups = rollups.compute_rollups(df)
+    return shot_rollups, rollups.rollup_metrics(shot_rollups)
+
+def show_figure(figure_id, filter_state, build):
+    """Draw a figure from the figure cache, building it only on a miss"""
+    data_version, *filters = filter_state
+    fig = cached_figure(figure_id, data_version, filters, build)
+    st.plotly_chart(fig, use_container_width=True)
+
+def club_distribution_figure(df, y, title, chart='box', height=None):
+    """Box or violin plot of a metric per club"""
+    import plotly.express as px
+    fig = getattr(px, chart)(
+        df, x='Club Name', y=y,
+        title=title,
+        color='Club Name'
+    )
+    fig.update_layout(showlegend=False, height=height)
+    return fig
+
+def club_frequency_figure(df):
+    """Bar chart of the number of shots per club"""
+    import plotly.express as px
+    club_counts = df['Club Name'].value_counts()
+    club_counts = club_counts[club_counts > 0]
+    return px.bar(
+        x=club_counts.index, y=club_counts.values,
+        title="Shot Frequency by Club",
+        labels={'x': 'Club', 'y': 'Number of Shots'}
+    )
+
+def roll_by_club_figure(df):
+    """Bar chart of the average roll per club"""
+    import plotly.express as px
+    avg_roll = df.groupby('Club Name', observed=True)['Roll'].mean().reset_index()
+    
+    return px.bar(
+        avg_roll, x='Club Name', y='Roll',
+        title="Average Roll Distance by Club",
+        color='Roll', color_continuous_scale='viridis'
+    )
+
+def carry_trend_figure(df):
+    """Daily average carry per club"""
+    import plotly.express as px
+    daily_avg = df.groupby(['Date', 'Club Name'], observed=True)['Carry (yds)'].mean().reset_index()
+    return px.line(
+        daily_avg, x='Date', y='Carry (yds)', color='Club Name',
+        title="Carry Distance Trends Over Time"
+    )
+
+def launch_histogram_figure(df):
+    """Launch angle histogram per club"""
+    import plotly.express as px
+    return px.histogram(
+        df, x='Launch Angle (deg)', color='Club Name',
+        title="Launch Angle Distribution", nbins=30,
+        marginal="box"
+    )
+
+def render_overview_tab(df, filter_state):
+    """Overview tab: distributions and usage by club"""
+    st.subheader("Performance Overview")
     
-    df['Club Name'] = df['Club Name'].map(club_name_map).fillna(df['Club Name'])
+    col1, col2 = st.columns(2)
     
-    # Convert date column
-    if 'Shot Created Date' in df.columns:
-        df['Shot Created Date'] = pd.to_datetime(df['Shot Created Date'], errors='coerce')
-        df['Date'] = df['Shot Created Date'].dt.date
+    with col1:
+        # Carry distance by club
+        show_figure('carry_by_club', filter_state, lambda: club_distribution_figure(
+            df, 'Carry (yds)', "Carry Distance Distribution by Club", height=500
+        ))
     
-    # Ensure numeric columns
-    numeric_cols = [
-        'Ball Speed (mph)', 'Push/Pull (deg L-/R+)', 'Launch Angle (deg)',
-        'Back Spin (rpm)', 'Side Spin (rpm L-/R+)', 'Total Spin (rpm)',
-        'Carry (yds)', 'Total Distance (yds)', 'Offline (yds L-/R+)',
-        'Peak Height (yds)', 'Descent Angle (deg)'
-    ]
+    with col2:
+        # Ball speed by club
+        show_figure('ball_speed_by_club', filter_state, lambda: club_distribution_figure(
+            df, 'Ball Speed (mph)', "Ball Speed Distribution by Club", chart='violin', height=500
+        ))
     
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    # Club usage frequency
+    show_figure('club_frequency', filter_state, lambda: club_frequency_figure(df))
+
+def render_distance_tab(df, filter_state):
+    """Distance tab: carry vs total, roll and carry trends"""
+    from charts import scatter_figure
+    st.subheader("Distance Analysis")
     
-    # Filter to valid clubs
-    valid_clubs = ['Dr', '3w', '5w', '3h', '4h', '5h', '3i', '4i', '5i', '6i', '7i', '8i', '9i', 'PW', 'GW', 'SW', 'LW']
-    df = df[df['Club Name'].isin(valid_clubs)]
+    col1, col2 = st.columns(2)
     
-    # Remove rows with missing critical data
-    df = df.dropna(subset=['Ball Speed (mph)', 'Carry (yds)'])
+    with col1:
+        # Carry vs Total Distance
+        show_figure('carry_vs_total', filter_state, lambda: scatter_figure(
+            df, x='Carry (yds)', y='Total Distance (yds)',
+            color='Club Name', title="Carry vs Total Distance",
+            hover_data=['Launch Angle (deg)', 'Ball Speed (mph)']
+        ))
     
-    return df
+    with col2:
+        # Distance efficiency by club
+        if 'Roll' in df.columns:
+            show_figure('roll_by_club', filter_state, lambda: roll_by_club_figure(df))
+    
+    # Distance trends over time
+    if 'Date' in df.columns:
+        show_figure('carry_trend', filter_state, lambda: carry_trend_figure(df))
 
-def create_performance_metrics(df):
-    """Calculate key performance metrics"""
-    if df.empty:
-        return {}
-    
-    metrics = {
-        'total_shots': len(df),
-        'avg_carry': df['Carry (yds)'].mean(),
-        'avg_ball_speed': df['Ball Speed (mph)'].mean(),
-        'avg_launch_angle': df['Launch Angle (deg)'].mean(),
-        'sessions_count': df['Session_File'].nunique() if 'Session_File' in df.columns else 0,
-        'clubs_used': df['Club Name'].nunique(),
-        'date_range': (df['Date'].min(), df['Date'].max()) if 'Date' in df.columns else (None, None)
-    }
-    return metrics
+def render_launch_tab(df, filter_state):
+    """Launch conditions tab: launch and speed vs carry"""
+    from charts import scatter_figure
+    st.subheader("Launch Conditions")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Launch angle vs carry
+        show_figure('launch_vs_carry', filter_state, lambda: scatter_figure(
+            df, x='Launch Angle (deg)', y='Carry (yds)',
+            color='Club Name', title="Launch Angle vs Carry Distance",
+            trendlines=load_trendlines(*filter_state, 'Launch Angle (deg)', 'Carry (yds)')
+        ))
+    
+    with col2:
+        # Ball speed vs carry
+        show_figure('ball_speed_vs_carry', filter_state, lambda: scatter_figure(
+            df, x='Ball Speed (mph)', y='Carry (yds)',
+            color='Club Name', title="Ball Speed vs Carry Distance",
+            trendlines=load_trendlines(*filter_state, 'Ball Speed (mph)', 'Carry (yds)')
+        ))
+    
+    # Launch angle distribution
+    show_figure('launch_histogram', filter_state, lambda: launch_histogram_figure(df))
+
+def render_spin_tab(df, filter_state):
+    """Spin tab: spin by club, side spin vs offline, spin efficiency"""
+    from charts import scatter_figure
+    st.subheader("Spin Analysis")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Total spin by club
+        show_figure('spin_by_club', filter_state, lambda: club_distribution_figure(
+            df, 'Total Spin (rpm)', "Total Spin Distribution by Club"
+        ))
+    
+    with col2:
+        # Side spin vs offline
+        if 'Side Spin (rpm L-/R+)' in df.columns and 'Offline (yds L-/R+)' in df.columns:
+            show_figure('side_spin_vs_offline', filter_state, lambda: scatter_figure(
+                df, x='Side Spin (rpm L-/R+)', y='Offline (yds L-/R+)',
+                color='Club Name', title="Side Spin vs Offline Distance",
+                trendlines=load_trendlines(*filter_state, 'Side Spin (rpm L-/R+)', 'Offline (yds L-/R+)')
+            ))
+    
+    # Spin efficiency analysis
+    if 'Spin_Efficiency' in df.columns:
+        show_figure('spin_efficiency_by_club', filter_state, lambda: club_distribution_figure(
+            df, 'Spin_Efficiency', "Spin Efficiency by Club (Back Spin / Total Spin)"
+        ))
+
+def render_detail_tab(df, shot_rollups, dataset, footprint, filters):
+    """Detailed data tab: club summary, memory usage and raw shots"""
+    st.subheader("Detailed Data Analysis")
+    
+    # Club performance summary
+    st.subheader("Club Performance Summary")
+    
+    summary_stats = rollups.rollup_summary(shot_rollups, {
+        'Ball Speed (mph)': ['mean', 'std', 'count'],
+        'Carry (yds)': ['mean', 'std', 'min', 'max'],
+        'Launch Angle (deg)': ['mean', 'std'],
+        'Total Spin (rpm)': ['mean', 'std']
+    }).round(2)
+    summary_stats = summary_stats.reset_index()
+    
+    st.dataframe(summary_stats, use_container_width=True)
+    
+    # Memory footprint of the loaded shots
+    with st.expander("🧠 Memory Usage by Column"):
+        report = memory_report(df)
+        st.caption(
+            f"{report['Memory (KB)'].sum() / 1024:.2f} MB for {len(df):,} shots "
+            f"({'compact' if COMPACT_SCHEMA else 'full'} schema)"
+        )
+        st.caption(
+            f"This session holds {footprint['private_mb']:.2f} MB of its own; "
+            f"{footprint['shared_mb']:.2f} MB is a view of the {dataset['memory_mb']:.2f} MB "
+            f"dataset shared by all sessions"
+        )
+        st.dataframe(report, use_container_width=True)
+    
+    # Reuse of figures across reruns and filter changes
+    with st.expander("🗂️ Figure Cache"):
+        stats = cache_stats()
+        st.caption(
+            f"{stats['hits']:,} hits, {stats['misses']:,} misses ({stats['hit_rate']:.0%} hit rate), "
+            f"{stats['evictions']:,} evictions; {stats['figures']} figures using "
+            f"{stats['size_mb']:.1f} of {stats['budget_mb']:.0f} MB"
+        )
+    
+    # Raw data with filters
+    st.subheader("Raw Shot Data")
+    # Column picker, sort order and paging rerun only their own fragment
+    render_raw_data(dataset['index'], filters)
+    
+    # Download processed data
+    render_export(df, dataset['version'], filters)
+
+@st.fragment
+def render_raw_data(index, filters):
+    """Paginated raw shot table; its widgets rerun only this fragment
+    
+    Pages are slices of the index's precomputed sort permutations, so only
+    the visible rows are materialized and sent to the browser.
+    """
+    shots = index['shots']
+    
+    # Additional filters for detailed view
+    col1, col2 = st.columns(2)
+    with col1:
+        show_columns = st.multiselect(
+            "Select columns to display",
+            shots.columns.tolist(),
+            default=['Club Name', 'Ball Speed (mph)', 'Carry (yds)', 
+                    'Launch Angle (deg)', 'Total Spin (rpm)', 'Date']
+        )
+    
+    with col2:
+        sort_by = st.selectbox(
+            "Sort by",
+            [col for col in SORT_COLUMNS if col in index['sort_orders']],
+            index=0
+        )
+    
+    rows = sorted_positions(index, select_positions(index, *filters), sort_by)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+    with col2:
+        n_pages = max(-(-len(rows) // page_size), 1)
+        page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, value=1)
+    
+    if show_columns:
+        first = (page - 1) * page_size
+        page_rows = rows[first:first + page_size]
+        display_df = shots.take(page_rows)[show_columns].reset_index(drop=True)
+        display_df.index += first + 1
+        st.dataframe(display_shots(display_df), use_container_width=True, height=400)
+        st.caption(f"Shots {first + 1:,}–{first + len(page_rows):,} of {len(rows):,}")
+
+@st.fragment
+def render_export(df, data_version, filters):
+    """Download button whose file is only written when it is clicked
+    
+    Exports are cached on disk per data version and filter state.
+    """
+    from export import EXPORT_FORMATS, export_bytes
+    fmt = st.selectbox("Export format", list(EXPORT_FORMATS))
+    ext, mime = EXPORT_FORMATS[fmt]
+    st.download_button(
+        label=f"📥 Download Processed Data as {fmt}",
+        data=lambda: export_bytes(df, data_version, filters, fmt),
+        file_name=f"golf_analysis_{datetime.now().strftime('%Y%m%d')}.{ext}",
+        mime=mime,
+        on_click='ignore'
+    )
 
 def main():
     # Header
@@ -154,9 +394,9 @@ def main():
     
     # Load data
     with st.spinner("Loading golf data..."):
-        df = load_all_session_data()
+        summary = load_all_session_data()
     
-    if df.empty:
+    if summary['rows'] == 0:
         st.error("No data available. Please check your sessions folder and CSV files.")
         return
     
@@ -164,40 +404,59 @@ def main():
     st.sidebar.header("📊 Data Filters")
     
     # Date range filter
-    if 'Date' in df.columns and not df['Date'].isna().all():
+    date_filter = None
+    if summary['dates']:
         date_range = st.sidebar.date_input(
             "Select Date Range",
-            value=(df['Date'].min(), df['Date'].max()),
-            min_value=df['Date'].min(),
-            max_value=df['Date'].max()
+            value=(summary['dates'][0], summary['dates'][-1]),
+            min_value=summary['dates'][0],
+            max_value=summary['dates'][-1]
         )
         
         if len(date_range) == 2:
-            df = df[(df['Date'] >= date_range[0]) & (df['Date'] <= date_range[1])]
+            date_filter = tuple(date_range)
     
     # Club selection
-    available_clubs = sorted(df['Club Name'].unique())
+    available_clubs = summary['clubs']
     selected_clubs = st.sidebar.multiselect(
         "Select Clubs",
         available_clubs,
         default=available_clubs
     )
     
-    if selected_clubs:
-        df = df[df['Club Name'].isin(selected_clubs)]
+    # Bag order, so picking the same clubs in another order hits the same caches
+    club_filter = tuple(sort_clubs(selected_clubs)) if selected_clubs else None
     
     # Ball speed range
-    if 'Ball Speed (mph)' in df.columns:
+    speed_filter = None
+    min_speed, max_speed = summary['ball_speed']
+    if min_speed is not None:
         speed_range = st.sidebar.slider(
             "Ball Speed Range (mph)",
-            min_value=int(df['Ball Speed (mph)'].min()),
-            max_value=int(df['Ball Speed (mph)'].max()),
-            value=(int(df['Ball Speed (mph)'].min()), int(df['Ball Speed (mph)'].max()))
+            min_value=int(min_speed),
+            max_value=int(max_speed),
+            value=(int(min_speed), int(max_speed))
         )
-        df = df[(df['Ball Speed (mph)'] >= speed_range[0]) & (df['Ball Speed (mph)'] <= speed_range[1])]
+        # The full slider range keeps every shot, including the fastest one
+        if tuple(speed_range) != (int(min_speed), int(max_speed)):
+            speed_filter = tuple(speed_range)
+    
+    # Filters are index lookups into the process-wide dataset; contiguous
+    # selections are views of it, others take the matching rows once
+    data_version = summary['version']
+    dataset = load_dataset(data_version)
+    filters = (date_filter, club_filter, speed_filter)
+    df, footprint = shared_data.session_view(dataset, *filters)
+    
+    if df.empty:
+        st.warning("No shots match the selected filters.")
+        return
+    
+    # Trendline fits are cached per data version and filter state
+    filter_state = (data_version, date_filter, club_filter, speed_filter)
     
     # Performance metrics
-    metrics = create_performance_metrics(df)
+    shot_rollups, metrics = create_performance_metrics(df, dataset, date_filter, club_filter, speed_filter)
     
     # Display key metrics
     st.subheader("📈 Key Performance Metrics")
@@ -215,200 +474,27 @@ def main():
         st.metric("Sessions Analyzed", metrics['sessions_count'])
     
     # Main dashboard tabs
+    # Tabs track the selected tab so only its figures are built on a rerun
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "📊 Overview", "🎯 Distance Analysis", "📐 Launch Conditions", 
         "🌪️ Spin Analysis", "📋 Detailed Data"
-    ])
+    ], key='dashboard_tab', on_change='rerun')
     
     with tab1:
-        st.subheader("Performance Overview")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Carry distance by club
-            fig = px.box(
-                df, x='Club Name', y='Carry (yds)',
-                title="Carry Distance Distribution by Club",
-                color='Club Name'
-            )
-            fig.update_layout(showlegend=False, height=500)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Ball speed by club
-            fig = px.violin(
-                df, x='Club Name', y='Ball Speed (mph)',
-                title="Ball Speed Distribution by Club",
-                color='Club Name'
-            )
-            fig.update_layout(showlegend=False, height=500)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Club usage frequency
-        club_counts = df['Club Name'].value_counts()
-        fig = px.bar(
-            x=club_counts.index, y=club_counts.values,
-            title="Shot Frequency by Club",
-            labels={'x': 'Club', 'y': 'Number of Shots'}
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    
+        if tab1.open:
+            render_overview_tab(df, filter_state)
     with tab2:
-        st.subheader("Distance Analysis")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Carry vs Total Distance
-            fig = px.scatter(
-                df, x='Carry (yds)', y='Total Distance (yds)',
-                color='Club Name', title="Carry vs Total Distance",
-                hover_data=['Launch Angle (deg)', 'Ball Speed (mph)']
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Distance efficiency by club
-            if 'Total Distance (yds)' in df.columns and 'Carry (yds)' in df.columns:
-                df['Roll'] = df['Total Distance (yds)'] - df['Carry (yds)']
-                avg_roll = df.groupby('Club Name')['Roll'].mean().reset_index()
-                
-                fig = px.bar(
-                    avg_roll, x='Club Name', y='Roll',
-                    title="Average Roll Distance by Club",
-                    color='Roll', color_continuous_scale='viridis'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-        
-        # Distance trends over time
-        if 'Date' in df.columns:
-            daily_avg = df.groupby(['Date', 'Club Name'])['Carry (yds)'].mean().reset_index()
-            fig = px.line(
-                daily_avg, x='Date', y='Carry (yds)', color='Club Name',
-                title="Carry Distance Trends Over Time"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-    
+        if tab2.open:
+            render_distance_tab(df, filter_state)
     with tab3:
-        st.subheader("Launch Conditions")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Launch angle vs carry
-            fig = px.scatter(
-                df, x='Launch Angle (deg)', y='Carry (yds)',
-                color='Club Name', title="Launch Angle vs Carry Distance",
-                trendline="ols"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Ball speed vs carry
-            fig = px.scatter(
-                df, x='Ball Speed (mph)', y='Carry (yds)',
-                color='Club Name', title="Ball Speed vs Carry Distance",
-                trendline="ols"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Launch angle distribution
-        fig = px.histogram(
-            df, x='Launch Angle (deg)', color='Club Name',
-            title="Launch Angle Distribution", nbins=30,
-            marginal="box"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    
+        if tab3.open:
+            render_launch_tab(df, filter_state)
     with tab4:
-        st.subheader("Spin Analysis")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Total spin by club
-            fig = px.box(
-                df, x='Club Name', y='Total Spin (rpm)',
-                title="Total Spin Distribution by Club",
-                color='Club Name'
-            )
-            fig.update_layout(showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Side spin vs offline
-            if 'Side Spin (rpm L-/R+)' in df.columns and 'Offline (yds L-/R+)' in df.columns:
-                fig = px.scatter(
-                    df, x='Side Spin (rpm L-/R+)', y='Offline (yds L-/R+)',
-                    color='Club Name', title="Side Spin vs Offline Distance",
-                    trendline="ols"
-                )
-                st.plotly_chart(fig, use_container_width=True)
-        
-        # Spin efficiency analysis
-        if 'Back Spin (rpm)' in df.columns and 'Side Spin (rpm L-/R+)' in df.columns:
-            df['Spin_Efficiency'] = df['Back Spin (rpm)'] / (df['Back Spin (rpm)'] + abs(df['Side Spin (rpm L-/R+)']))
-            
-            fig = px.box(
-                df, x='Club Name', y='Spin_Efficiency',
-                title="Spin Efficiency by Club (Back Spin / Total Spin)",
-                color='Club Name'
-            )
-            fig.update_layout(showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
-    
+        if tab4.open:
+            render_spin_tab(df, filter_state)
     with tab5:
-        st.subheader("Detailed Data Analysis")
-        
-        # Club performance summary
-        st.subheader("Club Performance Summary")
-        
-        summary_stats = df.groupby('Club Name').agg({
-            'Ball Speed (mph)': ['mean', 'std', 'count'],
-            'Carry (yds)': ['mean', 'std', 'min', 'max'],
-            'Launch Angle (deg)': ['mean', 'std'],
-            'Total Spin (rpm)': ['mean', 'std']
-        }).round(2)
-        
-        # Flatten column names
-        summary_stats.columns = [f"{col[0]}_{col[1]}" for col in summary_stats.columns]
-        summary_stats = summary_stats.reset_index()
-        
-        st.dataframe(summary_stats, use_container_width=True)
-        
-        # Raw data with filters
-        st.subheader("Raw Shot Data")
-        
-        # Additional filters for detailed view
-        col1, col2 = st.columns(2)
-        with col1:
-            show_columns = st.multiselect(
-                "Select columns to display",
-                df.columns.tolist(),
-                default=['Club Name', 'Ball Speed (mph)', 'Carry (yds)', 
-                        'Launch Angle (deg)', 'Total Spin (rpm)', 'Date']
-            )
-        
-        with col2:
-            sort_by = st.selectbox(
-                "Sort by",
-                ['Shot Created Date', 'Carry (yds)', 'Ball Speed (mph)', 'Club Name'],
-                index=0
-            )
-        
-        if show_columns:
-            display_df = df[show_columns].sort_values(sort_by, ascending=False)
-            st.dataframe(display_df, use_container_width=True, height=400)
-        
-        # Download processed data
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Processed Data as CSV",
-            data=csv,
-            file_name=f"golf_analysis_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
-        )
+        if tab5.open:
+            render_detail_tab(df, shot_rollups, dataset, footprint, filters)
 
 # Sidebar information
 with st.sidebar:
@@ -431,6 +517,8 @@ with st.sidebar:
     
     if st.button("🔄 Refresh Data"):
         st.cache_data.clear()
+        st.cache_resource.clear()
+        clear_figure_cache()
         st.rerun()
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+"""
+On-demand exports of filtered shot data.
+
+Exports are written only when a download is requested and are kept on disk
+as ``data/exports/<data version>-<filter hash>.<ext>``, so asking again for
+the same data and filters reuses the file. Rows are written in chunks of
+``EXPORT_CHUNK_ROWS``, so even large exports never hold more than one chunk
+of serialized text in memory. Exports of older data versions are pruned
+when a new one is written.
+"""
+import gzip
+import hashlib
+import io
+import os
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from figure_cache import normalize_filters
+from shot_store import DATA_ROOT
+
+EXPORT_DIR = os.path.join(DATA_ROOT, 'data', 'exports')
+EXPORT_CHUNK_ROWS = 50_000
+
+# Format label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def filter_hash(filters):
+    """Short stable hash of a filter state, whatever order the clubs were picked in"""
+    return hashlib.sha1(repr(normalize_filters(filters)).encode('utf-8')).hexdigest()[:16]
+
+
+def export_path(data_version, filters, fmt, export_dir=EXPORT_DIR):
+    """Where the export of a data version and filter state is cached"""
+    ext, _ = EXPORT_FORMATS[fmt]
+    return os.path.join(export_dir, f'{data_version}-{filter_hash(filters)}.{ext}')
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield start, df.iloc[start:start + chunk_rows]
+
+
+def write_export(df, path, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write ``df`` to ``path`` in ``fmt``, chunk by chunk and atomically"""
+    # Unique per writer: downloads are generated on their own threads
+    tmp_path = f'{path}.{os.getpid()}-{threading.get_ident()}.tmp'
+    if fmt == 'Parquet':
+        # Object columns (dates) need values to infer their Arrow type
+        schema = pa.Schema.from_pandas(df.iloc[:chunk_rows], preserve_index=False)
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for _, chunk in _chunks(df, chunk_rows):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    else:
+        opener = gzip.open if fmt == 'CSV (gzip)' else open
+        with opener(tmp_path, 'wb') as raw, io.TextIOWrapper(raw, encoding='utf-8', newline='') as out:
+            for start, chunk in _chunks(df, chunk_rows):
+                chunk.to_csv(out, index=False, header=(start == 0))
+    os.replace(tmp_path, path)
+
+
+def prune_exports(data_version, export_dir=EXPORT_DIR):
+    """Delete cached exports of other data versions
+
+    Temporary files are left alone: they belong to writers still running.
+    """
+    if not os.path.isdir(export_dir):
+        return
+    prefix = f'{data_version}-'
+    for name in os.listdir(export_dir):
+        if not name.startswith(prefix) and not name.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(export_dir, name))
+            except FileNotFoundError:
+                # Pruned concurrently by another writer
+                pass
+
+
+def cached_export(df, data_version, filters, fmt, export_dir=EXPORT_DIR):
+    """Path of the export of ``df``, writing it on the first request
+
+    ``df`` must be the shots selected by ``filters`` at ``data_version``;
+    together they identify the cached file.
+    """
+    path = export_path(data_version, filters, fmt, export_dir)
+    if not os.path.exists(path):
+        os.makedirs(export_dir, exist_ok=True)
+        prune_exports(data_version, export_dir)
+        write_export(df, path, fmt)
+    return path
+
+
+def export_bytes(df, data_version, filters, fmt, export_dir=EXPORT_DIR):
+    """Contents of the cached export, for a download button"""
+    with open(cached_export(df, data_version, filters, fmt, export_dir), 'rb') as f:
+        return f.read()
@@ -0,0 +1,94 @@
+"""
+Process-wide LRU cache of built plotly figures.
+
+Figures are keyed by (figure id, data version, normalized filter state) and
+stored as plain figure dicts. The cache holds at most ``FIGURE_CACHE_MB`` of
+serialized figure JSON; the least recently used figures are evicted first.
+Going back to a filter combination that was already drawn reuses its
+figures without touching the shot data. ``cache_stats`` reports hits,
+misses and evictions.
+"""
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from clubs import sort_clubs
+
+FIGURE_CACHE_MB = float(os.environ.get('GOLF_FIGURE_CACHE_MB', 64))
+
+_figures = OrderedDict()
+_sizes = {}
+_total_bytes = 0
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+# Streamlit runs each session's script on its own thread
+_lock = threading.Lock()
+
+
+def normalize_filters(filters):
+    """Make equal filter states compare equal (club selection order, date types)"""
+    date_range, clubs, ball_speed = filters
+    if date_range is not None:
+        date_range = tuple(value.isoformat() if isinstance(value, date) else value for value in date_range)
+    if clubs is not None:
+        clubs = tuple(sort_clubs(clubs))
+    if ball_speed is not None:
+        ball_speed = tuple(float(value) for value in ball_speed)
+    return date_range, clubs, ball_speed
+
+
+def cached_figure(figure_id, data_version, filters, build, budget_mb=FIGURE_CACHE_MB):
+    """Return the cached figure dict, calling ``build()`` on a miss
+
+    ``filters`` is the (date range, clubs, ball speed) state ``build`` draws.
+    """
+    global _total_bytes
+    key = (figure_id, data_version, normalize_filters(filters))
+    with _lock:
+        figure = _figures.get(key)
+        if figure is not None:
+            _figures.move_to_end(key)
+            _stats['hits'] += 1
+            return figure
+        _stats['misses'] += 1
+
+    import plotly.io as pio  # only needed once a figure is built
+    figure = build().to_dict()
+    size = len(pio.to_json(figure, validate=False))
+
+    with _lock:
+        if key in _figures:
+            # Built concurrently by another session
+            _total_bytes -= _sizes[key]
+        _figures[key] = figure
+        _sizes[key] = size
+        _total_bytes += size
+        # The newest figure is kept even if it alone exceeds the budget
+        while len(_figures) > 1 and _total_bytes > budget_mb * 2**20:
+            old_key, _ = _figures.popitem(last=False)
+            _total_bytes -= _sizes.pop(old_key)
+            _stats['evictions'] += 1
+    return figure
+
+
+def cache_stats():
+    """Hit, miss and eviction counts plus the cache's size"""
+    with _lock:
+        stats = dict(_stats)
+        stats['figures'] = len(_figures)
+        stats['size_mb'] = _total_bytes / 2**20
+    stats['budget_mb'] = FIGURE_CACHE_MB
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+
+def clear_figure_cache():
+    """Drop every cached figure and reset the statistics"""
+    global _total_bytes
+    with _lock:
+        _total_bytes = 0
+        _figures.clear()
+        _sizes.clear()
+        for name in _stats:
+            _stats[name] = 0
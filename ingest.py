@@ -0,0 +1,254 @@
+"""
+Incremental ingest of launch monitor session CSVs.
+
+Every file in the sessions folder is fingerprinted by size, mtime and content
+hash. Only new or changed files are parsed and cleaned, and their rows are
+written to the partitioned shot store (see ``shot_store``), replacing any
+rows from an earlier version of the same file, so a refresh costs time
+proportional to the files that changed rather than the whole archive.
+The per-session, per-club rollups (see ``rollups``) are updated from the
+same parsed frames.
+
+Files too large to parse in one go (e.g. a multi-year ``sessions.py``
+export) are streamed: read, cleaned and appended to the store one chunk at a
+time under a memory ceiling.
+
+    python ingest.py all_sessions_exported.csv --memory-limit-mb 256
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import rollups
+import schema_registry
+import shot_store
+from cleaning import clean_and_process_data
+
+DATA_DIR = os.path.join(shot_store.DATA_ROOT, 'data')
+MANIFEST_FILE = 'session_manifest.json'
+
+# Memory ceiling for parsing one file; larger files are streamed in chunks
+MEMORY_LIMIT_MB = 256
+# Rows read to estimate the in-memory size of a parsed row
+SAMPLE_ROWS = 1000
+# Peak memory while a chunk is cleaned and written, as a multiple of its parsed
+# size (cleaned copy, Arrow table and Parquet buffers)
+CHUNK_OVERHEAD = 8
+# Processes parsing new or changed files on a cold start
+INGEST_WORKERS = int(os.environ.get('GOLF_INGEST_WORKERS', os.cpu_count() or 1))
+
+
+def file_fingerprint(path, previous=None):
+    """Return the size, mtime, sha256 and store schema version of a file
+
+    When size and mtime match ``previous`` the stored hash is reused so
+    unchanged files are never read.
+    """
+    stat = os.stat(path)
+    fingerprint = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'schema': shot_store.SCHEMA_VERSION}
+
+    if previous and previous['size'] == stat.st_size and previous['mtime'] == stat.st_mtime_ns:
+        fingerprint['sha256'] = previous['sha256']
+        return fingerprint
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    fingerprint['sha256'] = digest.hexdigest()
+    return fingerprint
+
+
+def load_manifest(data_dir=DATA_DIR):
+    """Load the fingerprint manifest of already ingested files"""
+    path = os.path.join(data_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, data_dir=DATA_DIR):
+    """Atomically write the fingerprint manifest"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, MANIFEST_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def read_session_file(file_path, filename, clean_fn):
+    """Parse and clean a single session CSV"""
+    df = schema_registry.read_csv(file_path)
+    df['Session_File'] = filename
+    return clean_fn(df)
+
+
+def stream_session_file(file_path, filename, clean_fn=clean_and_process_data,
+                        player=shot_store.DEFAULT_PLAYER, store_dir=shot_store.STORE_DIR,
+                        memory_limit_mb=MEMORY_LIMIT_MB, replace=True):
+    """Clean a large session CSV into the store one chunk at a time
+
+    The chunk size is derived from the parsed size of a small sample so
+    that a chunk and its cleaned copies stay under ``memory_limit_mb``.
+    Returns the rollups of the shots written.
+    """
+    if replace:
+        shot_store.delete_sources([filename], player, store_dir)
+
+    schema = schema_registry.sniff_csv(file_path)
+    chunk_rollups = []
+    with pd.read_csv(file_path, iterator=True, **schema_registry.read_csv_kwargs(schema)) as reader:
+        chunk = schema_registry.rename_columns(reader.get_chunk(SAMPLE_ROWS), schema)
+        bytes_per_row = max(chunk.memory_usage(deep=True).sum() / max(len(chunk), 1), 1)
+        chunk_rows = max(SAMPLE_ROWS, int(memory_limit_mb * 2**20 / (bytes_per_row * CHUNK_OVERHEAD)))
+
+        part = 0
+        while True:
+            chunk['Session_File'] = filename
+            cleaned = clean_fn(chunk)
+            shot_store.write_shots(cleaned, player, store_dir, source=filename, replace=False, part=part)
+            chunk_rollups.append(rollups.compute_rollups(cleaned))
+            part += 1
+            del chunk, cleaned
+            try:
+                chunk = schema_registry.rename_columns(reader.get_chunk(chunk_rows), schema)
+            except StopIteration:
+                break
+
+    return rollups.combine_rollups(chunk_rollups)
+
+
+def ingest_file(file_path, filename, clean_fn=clean_and_process_data,
+                player=shot_store.DEFAULT_PLAYER, store_dir=shot_store.STORE_DIR,
+                memory_limit_mb=MEMORY_LIMIT_MB):
+    """Parse, clean and store one session file, streaming it if it is large
+
+    Runs in pool workers alongside other writers, so it only adds files to
+    the store: ``ingest_sessions`` removes earlier rows of the file before
+    the pool starts and the rows of a failed file after it drains.
+    Returns the rollups of the stored shots.
+    """
+    if os.path.getsize(file_path) > memory_limit_mb * 2**20 / CHUNK_OVERHEAD:
+        return stream_session_file(file_path, filename, clean_fn, player, store_dir,
+                                   memory_limit_mb, replace=False)
+    df = read_session_file(file_path, filename, clean_fn)
+    shot_store.write_shots(df, player, store_dir, source=filename, replace=False)
+    return rollups.compute_rollups(df)
+
+
+def ingest_sessions(sessions_dir, clean_fn=clean_and_process_data, data_dir=DATA_DIR,
+                    player=shot_store.DEFAULT_PLAYER, store_dir=shot_store.STORE_DIR,
+                    memory_limit_mb=MEMORY_LIMIT_MB, workers=INGEST_WORKERS):
+    """Bring the shot store up to date with the sessions folder
+
+    New and changed files are parsed by up to ``workers`` processes, which
+    share ``memory_limit_mb``; files too large for a worker's share are
+    streamed in chunks. The player's rollups are updated for exactly those
+    files. Returns a report listing the files that were added, changed,
+    removed or failed to load.
+    """
+    manifest = load_manifest(data_dir)
+    store_empty = not shot_store.has_player(player, store_dir)
+    if store_empty:
+        # Manifest without its stored shots (or a first run): ingest everything
+        manifest = {}
+
+    csv_files = sorted(f for f in os.listdir(sessions_dir) if f.endswith('.csv'))
+    report = {'added': [], 'changed': [], 'removed': [], 'unchanged': 0, 'errors': {}}
+    new_manifest = {}
+    pending = {}
+
+    for filename in csv_files:
+        file_path = os.path.join(sessions_dir, filename)
+        previous = manifest.get(filename)
+        try:
+            fingerprint = file_fingerprint(file_path, previous)
+        except OSError as e:
+            report['errors'][filename] = str(e)
+            continue
+
+        if (previous and previous['sha256'] == fingerprint['sha256']
+                and previous.get('schema') == fingerprint['schema']):
+            new_manifest[filename] = fingerprint
+            report['unchanged'] += 1
+        else:
+            pending[filename] = fingerprint
+
+    # Only a changed file has earlier rows that need replacing, unless the
+    # store has rows the manifest does not track. Deleting prunes emptied
+    # partition folders, so it never runs while workers write.
+    shot_store.delete_sources([filename for filename in pending if filename in manifest or not manifest],
+                              player, store_dir)
+
+    workers = max(1, min(workers, len(pending)))
+    jobs = [
+        (os.path.join(sessions_dir, filename), filename, clean_fn, player, store_dir,
+         memory_limit_mb // workers)
+        for filename in pending
+    ]
+
+    # Each result is the file's rollups or the exception that stopped it
+    if workers == 1:
+        results = []
+        for job in jobs:
+            try:
+                results.append(ingest_file(*job))
+            except Exception as e:
+                results.append(e)
+    else:
+        # spawn rather than fork: the Streamlit server process is multi-threaded
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [pool.submit(ingest_file, *job) for job in jobs]
+            results = [future.exception() or future.result() for future in futures]
+
+    new_rollups = {}
+    for filename, result in zip(pending, results):
+        if isinstance(result, Exception):
+            report['errors'][filename] = str(result)
+            continue
+        new_rollups[filename] = result
+        new_manifest[filename] = pending[filename]
+        report['changed' if filename in manifest else 'added'].append(filename)
+
+    report['removed'] = sorted(set(manifest) - set(csv_files))
+    # Failed files leave no partial rows behind
+    failed = [filename for filename in pending if filename in report['errors']]
+    shot_store.delete_sources(failed + report['removed'], player, store_dir)
+
+    if not manifest and not store_empty:
+        # Shots stored outside the manifest (e.g. by ``main`` below): the
+        # saved rollups cannot be trusted to cover them, so summarize the store
+        rollups.save_rollups(rollups.rebuild_rollups(player, store_dir), player, store_dir)
+    elif pending or report['removed'] or not os.path.exists(rollups.rollup_path(player, store_dir)):
+        # Failed files had their rows removed, so they lose their rollups too
+        rollups.refresh_rollups(new_rollups, set(pending) | set(report['removed']),
+                                player, store_dir, reset=store_empty)
+
+    if new_manifest != manifest:
+        save_manifest(new_manifest, data_dir)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a large session export into the shot store")
+    parser.add_argument('csv_path')
+    parser.add_argument('--player', default=shot_store.DEFAULT_PLAYER)
+    parser.add_argument('--memory-limit-mb', type=int, default=MEMORY_LIMIT_MB)
+    args = parser.parse_args()
+
+    filename = os.path.basename(args.csv_path)
+    file_rollups = stream_session_file(args.csv_path, filename, player=args.player,
+                                       memory_limit_mb=args.memory_limit_mb)
+    rollups.refresh_rollups({filename: file_rollups}, player=args.player)
+    print(f"Ingested {int(file_rollups['Shots'].sum())} shots from {filename}")
+
+
+if __name__ == "__main__":
+    main()
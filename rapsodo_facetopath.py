@@ -7,17 +7,16 @@ from sklearn.metrics import r2_score
 from xgboost import XGBRegressor
 from sklearn.linear_model import RidgeCV
 
+import schema_registry
+
 #%% 🧹 Data Loading and Cleaning
 # Replace with your file paths
 file_paths = ["7-6-25_range.csv", "7-15-25_range.csv", "range_7-2-25.csv"]
-dfs = [pd.read_csv(fp, header=2) for fp in file_paths]
+# The header row is sniffed from the first few KB of each file (Rapsodo
+# exports start with a few preamble lines); Rapsodo column names are kept
+dfs = [schema_registry.read_csv(fp, markers=('Club Type',), aliases={}) for fp in file_paths]
 df_combined = pd.concat(dfs, ignore_index=True)
 
-# Fix column header row
-header_row = df_combined[df_combined.apply(lambda r: r.astype(str).str.contains('Club Type').any(), axis=1)].index[0]
-df_combined.columns = df_combined.iloc[header_row]
-df_combined = df_combined.drop(index=range(0, header_row + 1)).reset_index(drop=True)
-
 # Ensure numeric
 numeric_cols = [
     'Club Path', 'Club Speed', 'Launch Angle', 'Launch Direction',
@@ -0,0 +1,244 @@
+"""
+Materialized per-session, per-date, per-club rollups of shot metrics.
+
+For every (Session_File, Date, Club Name) group the store keeps the shot
+count and, per metric, the count, sum, sum of squares, min and max of its
+values. Those combine exactly, so headline averages and per-club summary
+tables (mean, std, count, min, max) for any date and club selection are
+answered from a few hundred rollup rows instead of rescanning every shot.
+
+Rollups are updated at ingest one source file at a time and saved next to
+the shots as ``<store>/_rollups/player=<name>.parquet`` (the leading
+underscore keeps the file out of the shot dataset).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import shot_store
+from clubs import CLUB_DTYPE
+
+ROLLUP_KEYS = ['Session_File', 'Date', 'Club Name']
+
+# Metrics summarized in the dashboard's headline and club summary
+ROLLUP_METRICS = [
+    'Ball Speed (mph)',
+    'Carry (yds)',
+    'Total Distance (yds)',
+    'Launch Angle (deg)',
+    'Total Spin (rpm)',
+]
+
+# Statistic -> how partial rollups of it combine
+ROLLUP_STATS = {'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'}
+
+ROLLUP_COLUMNS = ROLLUP_KEYS + ['Shots'] + [
+    f'{metric}_{stat}' for metric in ROLLUP_METRICS for stat in ROLLUP_STATS
+]
+
+
+def rollup_path(player=shot_store.DEFAULT_PLAYER, store_dir=shot_store.STORE_DIR):
+    """Return the file holding a player's rollups"""
+    return os.path.join(store_dir, '_rollups', f'player={player}.parquet')
+
+
+def data_version(player=shot_store.DEFAULT_PLAYER, store_dir=shot_store.STORE_DIR):
+    """Token that changes whenever ingest changes a player's stored shots"""
+    path = rollup_path(player, store_dir)
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+
+
+def empty_rollups():
+    """A rollup frame without any groups"""
+    return pd.DataFrame({col: pd.Series(dtype=float) for col in ROLLUP_COLUMNS}).astype(
+        {'Session_File': object, 'Date': object, 'Club Name': CLUB_DTYPE, 'Shots': 'int64'})
+
+
+def compute_rollups(df, club_dtype=CLUB_DTYPE):
+    """Aggregate cleaned shots into one rollup row per session, date and club
+
+    ``club_dtype`` is the categorical club names are cast to; pass
+    ``'category'`` to keep names outside the standard bag.
+    """
+    if df.empty:
+        return empty_rollups()
+
+    frame = pd.DataFrame({
+        'Session_File': df['Session_File'].astype(str),
+        'Date': pd.to_datetime(df['Date'], errors='coerce').dt.date,
+        'Club Name': df['Club Name'].astype(club_dtype),
+    })
+    squares = {}
+    for metric in ROLLUP_METRICS:
+        if metric in df.columns:
+            values = pd.to_numeric(df[metric], errors='coerce').astype(float)
+        else:
+            values = pd.Series(np.nan, index=df.index)
+        frame[metric] = values
+        squares[f'{metric}_sumsq'] = values * values
+    frame = frame.assign(**squares)
+
+    # Rows without a date or club are never stored, so they are not counted
+    grouped = frame.groupby(ROLLUP_KEYS, observed=True, sort=False)
+    sq_columns = list(squares)
+    parts = [
+        grouped.size().rename('Shots'),
+        grouped[ROLLUP_METRICS].count().add_suffix('_count'),
+        grouped[ROLLUP_METRICS].sum().add_suffix('_sum'),
+        grouped[sq_columns].sum(),
+        grouped[ROLLUP_METRICS].min().add_suffix('_min'),
+        grouped[ROLLUP_METRICS].max().add_suffix('_max'),
+    ]
+    return pd.concat(parts, axis=1).reset_index()[ROLLUP_COLUMNS]
+
+
+def combine_rollups(frames):
+    """Merge partial rollups of the same groups (e.g. streamed chunks)"""
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return empty_rollups()
+
+    how = {'Shots': 'sum'}
+    how.update({f'{metric}_{stat}': combine
+                for metric in ROLLUP_METRICS for stat, combine in ROLLUP_STATS.items()})
+    combined = pd.concat(frames, ignore_index=True)
+    return combined.groupby(ROLLUP_KEYS, observed=True, sort=False).agg(how).reset_index()[ROLLUP_COLUMNS]
+
+
+def read_rollups_file(path):
+    """Read rollups saved by ``write_rollups_file``, empty if it is missing"""
+    if not os.path.exists(path):
+        return empty_rollups()
+
+    rollups = pd.read_parquet(path)
+    rollups['Date'] = pd.to_datetime(rollups['Date']).dt.date
+    rollups['Club Name'] = rollups['Club Name'].astype(CLUB_DTYPE)
+    return rollups
+
+
+def write_rollups_file(rollups, path):
+    """Atomically write rollups to a Parquet file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    out = rollups.astype({'Club Name': str})
+    out.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def load_rollups(player=shot_store.DEFAULT_PLAYER, store_dir=shot_store.STORE_DIR):
+    """Load a player's rollups, empty when none have been saved"""
+    return read_rollups_file(rollup_path(player, store_dir))
+
+
+def save_rollups(rollups, player=shot_store.DEFAULT_PLAYER, store_dir=shot_store.STORE_DIR):
+    """Atomically write a player's rollups"""
+    write_rollups_file(rollups, rollup_path(player, store_dir))
+
+
+def update_rollups(rollups, new_rollups, dropped_sources=()):
+    """Replace the rollups of re-ingested sources and drop deleted ones
+
+    ``new_rollups`` maps a source file to the rollups of its shots; every
+    source in it or in ``dropped_sources`` loses its old rows first.
+    """
+    stale = set(dropped_sources) | set(new_rollups)
+    kept = rollups[~rollups['Session_File'].isin(stale)]
+    frames = [frame for frame in [kept, *new_rollups.values()] if not frame.empty]
+    if not frames:
+        return empty_rollups()
+    rollups = pd.concat(frames, ignore_index=True)[ROLLUP_COLUMNS]
+    rollups['Club Name'] = rollups['Club Name'].astype(CLUB_DTYPE)
+    return rollups
+
+
+def refresh_rollups(new_rollups, dropped_sources=(), player=shot_store.DEFAULT_PLAYER,
+                    store_dir=shot_store.STORE_DIR, reset=False):
+    """Apply ``update_rollups`` to a player's saved rollups and save them
+
+    With ``reset`` the saved rollups are discarded first (every source is
+    being re-ingested). Shots stored before any rollups were saved are
+    summarized once from the store instead.
+    """
+    if reset:
+        updated = update_rollups(empty_rollups(), new_rollups, dropped_sources)
+    elif os.path.exists(rollup_path(player, store_dir)):
+        updated = update_rollups(load_rollups(player, store_dir), new_rollups, dropped_sources)
+    else:
+        updated = rebuild_rollups(player, store_dir)
+    save_rollups(updated, player, store_dir)
+    return updated
+
+
+def rebuild_rollups(player=shot_store.DEFAULT_PLAYER, store_dir=shot_store.STORE_DIR):
+    """Recompute a player's rollups from the stored shots"""
+    columns = ROLLUP_KEYS + ROLLUP_METRICS
+    df = shot_store.read_shots(player, columns=columns, store_dir=store_dir)
+    return compute_rollups(df)
+
+
+def select_rollups(rollups, date_range=None, clubs=None):
+    """Keep the rollup rows inside dashboard-style date and club filters"""
+    mask = np.ones(len(rollups), dtype=bool)
+    if date_range is not None:
+        start, end = date_range
+        if start is not None:
+            mask &= (rollups['Date'] >= pd.Timestamp(start).date()).to_numpy()
+        if end is not None:
+            mask &= (rollups['Date'] <= pd.Timestamp(end).date()).to_numpy()
+    if clubs is not None:
+        mask &= rollups['Club Name'].isin(list(clubs)).to_numpy()
+    return rollups[mask]
+
+
+def rollup_metrics(rollups):
+    """Headline metrics (shot count, averages, sessions, clubs, dates)"""
+    shots = int(rollups['Shots'].sum())
+    if shots == 0:
+        return {}
+
+    def mean(metric):
+        count = rollups[f'{metric}_count'].sum()
+        return rollups[f'{metric}_sum'].sum() / count if count else np.nan
+
+    present = rollups[rollups['Shots'] > 0]
+    return {
+        'total_shots': shots,
+        'avg_carry': mean('Carry (yds)'),
+        'avg_total_distance': mean('Total Distance (yds)'),
+        'avg_ball_speed': mean('Ball Speed (mph)'),
+        'avg_launch_angle': mean('Launch Angle (deg)'),
+        'sessions_count': present['Session_File'].nunique(),
+        'clubs_used': present['Club Name'].nunique(),
+        'date_range': (present['Date'].min(), present['Date'].max()),
+    }
+
+
+def rollup_summary(rollups, stats):
+    """Per-club summary table from rollups
+
+    ``stats`` maps a metric to the statistics wanted for it, any of 'mean',
+    'std' (sample), 'count', 'min' and 'max', as in ``DataFrame.agg``.
+    Columns are named ``<metric>_<stat>`` and clubs are in bag order.
+    """
+    by_club = rollups.groupby('Club Name', observed=True).sum(numeric_only=True)
+    lows = rollups.groupby('Club Name', observed=True).min(numeric_only=True)
+    highs = rollups.groupby('Club Name', observed=True).max(numeric_only=True)
+
+    summary = pd.DataFrame(index=by_club.index)
+    for metric, wanted in stats.items():
+        count = by_club[f'{metric}_count']
+        total = by_club[f'{metric}_sum']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = total / count.where(count > 0)
+            var = (by_club[f'{metric}_sumsq'] - total * mean) / (count - 1).where(count > 1)
+        values = {
+            'mean': mean,
+            'std': np.sqrt(var.clip(lower=0)),
+            'count': count.astype('int64'),
+            'min': lows[f'{metric}_min'],
+            'max': highs[f'{metric}_max'],
+        }
+        for stat in wanted:
+            summary[f'{metric}_{stat}'] = values[stat]
+    return summary
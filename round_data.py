@@ -0,0 +1,137 @@
+"""
+Indexed round shots for the FSX rounds dashboard.
+
+``load_round_dataset`` reads ``data/formatted_all_rounds_data.csv`` (written
+by ``src/FSX/main.py`` or ``round_parser.py``) once per file version and
+shapes it like the range-session data: compact dtypes, a ``shot_index``
+over date and club plus one row bitmap per course, and per-round, per-club
+rollups. Each round is a ``'<date> <course>'`` group in the rollups'
+``Session_File`` key (``'<date> <course> #2'`` and so on for later rounds
+at the same course that day), so headline metrics and per-club tables for any
+course, date and club selection come from the rollups, and the filtered
+shots are an index lookup instead of a rescan of the CSV.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import rollups
+from clubs import CLUB_ORDER, normalize_club_names
+from shot_index import build_shot_index, select_positions
+from shot_schema import compact_shots
+
+ROUNDS_FILE = os.path.join('data', 'formatted_all_rounds_data.csv')
+
+
+def rounds_version(path=ROUNDS_FILE):
+    """Version of the rounds file, changing whenever it is rewritten; None if missing"""
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return f'rounds-{stat.st_mtime_ns}-{stat.st_size}'
+
+
+def round_keys(df):
+    """'<date> <course>' of each shot, numbered for repeat rounds that day
+
+    Rounds are told apart by their 'Round Link'; rows without one (exports
+    from before the link was kept) by runs of consecutive rows with the
+    same date, course and score.
+    """
+    base = df['Date'].astype(str) + ' ' + df['Course'].astype(str)
+    run = base + ' ' + df['Round Score'].astype(str)
+    round_id = 'run-' + (run != run.shift()).cumsum().astype(str)
+    if 'Round Link' in df.columns:
+        round_id = df['Round Link'].fillna(round_id)
+
+    starts = ~round_id.duplicated()
+    numbers = starts.groupby(base).cumsum()[starts]
+    number = round_id.map(pd.Series(numbers.to_numpy(), index=round_id[starts].to_numpy()))
+    return base.where(number == 1, base + ' #' + number.astype(str))
+
+
+def read_round_shots(path=ROUNDS_FILE, compact=True):
+    """Formatted round shots keyed like session shots
+
+    'Club Name' is normalized like the range clubs ('Driver' and 'Dr' are
+    one club); generic entries such as 'Iron' or 'Putter' that name no
+    club keep the name as recorded so they stay selectable.
+    'Session_File' names the round.
+    """
+    df = pd.read_csv(path)
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce').dt.date
+    clubs = normalize_club_names(df['Club'])
+    generic = sorted(df.loc[clubs.isna() & df['Club'].notna(), 'Club'].astype(str).unique())
+    df['Club Name'] = pd.Categorical(
+        clubs.astype(object).where(clubs.notna(), df['Club']),
+        categories=CLUB_ORDER + generic, ordered=True,
+    )
+    df['Session_File'] = round_keys(df)
+    return compact_shots(df) if compact else df
+
+
+def load_round_dataset(path=ROUNDS_FILE, compact=True):
+    """Round shots, their filter index, rollups and one summary row per round"""
+    shots = read_round_shots(path, compact)
+    index = build_shot_index(shots)
+    shots = index['shots']
+
+    courses = shots['Course'].astype('category')
+    course_codes = courses.cat.codes.to_numpy()
+    index['courses'] = {
+        course: course_codes == code
+        for code, course in enumerate(courses.cat.categories)
+        if (course_codes == code).any()
+    }
+
+    rounds = shots.groupby('Session_File', observed=True, sort=False).agg(
+        Date=('Date', 'first'), Course=('Course', 'first'),
+        Score=('Round Score', 'first'), Shots=('Club', 'size'),
+    ).reset_index().rename(columns={'Session_File': 'Round'})
+
+    return {
+        'index': index,
+        'rollups': rollups.compute_rollups(shots, club_dtype='category'),
+        'rounds': rounds,
+    }
+
+
+def select_round_positions(index, date_range=None, clubs=None, courses=None):
+    """Row positions matching the filters, as ``(start, stop)`` or an array"""
+    positions = select_positions(index, date_range, clubs)
+    if courses is None:
+        return positions
+
+    mask = np.zeros(len(index['dates']), dtype=bool)
+    for course in courses:
+        bitmap = index['courses'].get(course)
+        if bitmap is not None:
+            mask |= bitmap
+    if isinstance(positions, tuple):
+        start, stop = positions
+        if mask[start:stop].all():
+            return positions
+        return start + np.flatnonzero(mask[start:stop])
+    return positions[mask[positions]]
+
+
+def filter_rounds(dataset, date_range=None, clubs=None, courses=None):
+    """The round shots and rollups matching course, date and club filters
+
+    Returns ``(shots, rollups)``; the shots are a zero-copy slice when the
+    filters select a contiguous run of rows.
+    """
+    index = dataset['index']
+    positions = select_round_positions(index, date_range, clubs, courses)
+    if isinstance(positions, tuple):
+        shots = index['shots'].iloc[positions[0]:positions[1]]
+    else:
+        shots = index['shots'].take(positions)
+
+    round_rollups = rollups.select_rollups(dataset['rollups'], date_range, clubs)
+    if courses is not None:
+        rounds = dataset['rounds']
+        selected = rounds.loc[rounds['Course'].isin(list(courses)), 'Round']
+        round_rollups = round_rollups[round_rollups['Session_File'].isin(selected)]
+    return shots, round_rollups
@@ -1,27 +1,43 @@
 #!/usr/bin/env python3
 """
 Simple script to run the Streamlit dashboard
+
+Host, port and data directory (the folder holding ``sessions/``) come from
+the command line or the GOLF_HOST, GOLF_PORT and GOLF_DATA_DIR environment
+variables.
 """
+import argparse
 import subprocess
 import sys
 import os
 
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard.py')
+
 def main():
     """Run the Streamlit dashboard"""
+    parser = argparse.ArgumentParser(description="Run the golf dashboard")
+    parser.add_argument('--host', default=os.environ.get('GOLF_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('GOLF_PORT', 8501)))
+    parser.add_argument('--data-dir', default=os.environ.get('GOLF_DATA_DIR', os.path.dirname(DASHBOARD)),
+                        help="directory containing the sessions/ folder")
+    args = parser.parse_args()
+
     try:
-        # Change to the project directory
-        os.chdir('/home/project')
-        
+        # The dashboard reads ./sessions relative to the data directory, and
+        # keeps its shot store, snapshot and exports under <data dir>/data
+        data_dir = os.path.abspath(args.data_dir)
+        os.chdir(data_dir)
+
         # Run streamlit
         subprocess.run([
-            sys.executable, '-m', 'streamlit', 'run', 'dashboard.py',
-            '--server.port', '8501',
-            '--server.address', '0.0.0.0'
-        ])
+            sys.executable, '-m', 'streamlit', 'run', DASHBOARD,
+            '--server.port', str(args.port),
+            '--server.address', args.host
+        ], env=dict(os.environ, GOLF_DATA_DIR=data_dir))
     except KeyboardInterrupt:
         print("\nDashboard stopped by user")
     except Exception as e:
         print(f"Error running dashboard: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,139 @@
+"""
+Header sniffing and schema registry for launch monitor CSV exports.
+
+Exports differ in encoding (UTF-8, UTF-8 with a BOM, a BOM that was itself
+mis-decoded into 'ï»¿', Windows-1252 degree signs), in how many preamble
+lines precede the header (Rapsodo) and in column names ('Ball Speed' vs
+'Ball Speed (mph)'). ``sniff_csv`` works all of that out from the first few
+KB of a file, and the resulting column mapping is cached per header
+fingerprint, so ``read_csv`` parses every file in a single pass with the
+right ``encoding``/``skiprows`` and canonical column names.
+"""
+import codecs
+import csv
+import hashlib
+import io
+
+import pandas as pd
+
+SAMPLE_BYTES = 64 * 1024
+
+# Header cells that identify the header row
+HEADER_MARKERS = ('Club Name', 'Club Type')
+
+# Byte order marks that survived as text, e.g. a UTF-8 BOM decoded as cp1252
+BOM_PREFIXES = ('\ufeff', 'ï»¿')
+
+# Unit-less export headers -> session CSV column names
+COLUMN_ALIASES = {
+    'Ball Speed': 'Ball Speed (mph)',
+    'Push/Pull': 'Push/Pull (deg L-/R+)',
+    'Launch Angle': 'Launch Angle (deg)',
+    'Back Spin': 'Back Spin (rpm)',
+    'Side Spin': 'Side Spin (rpm L-/R+)',
+    'Total Spin': 'Total Spin (rpm)',
+    'Carry': 'Carry (yds)',
+    'Total Distance': 'Total Distance (yds)',
+    'Offline': 'Offline (yds L-/R+)',
+    'Peak Height': 'Peak Height (yds)',
+    'Descent Angle': 'Descent Angle (deg)',
+    'Club Speed': 'Club Speed (mph)',
+    'Club Speed at Impact Location': 'Club Speed at Impact Location (mph)',
+    'Angle of Attack': 'Angle of Attack (deg)',
+    'Club Path': 'Club Path (deg out-in-/in-out+)',
+    'Face to Target': 'Face to Target (deg closed-/open+)',
+    'Lie': 'Lie (deg toe down-/toe up+)',
+    'Loft': 'Loft (deg)',
+    'Face Impact Horizontal': 'Face Impact Horizontal (mm toe-/heel+)',
+    'Face Impact Vertical': 'Face Impact Vertical (mm low-/high+)',
+    'Closure Rate': 'Closure Rate (deg/sec)',
+}
+
+# Header fingerprint -> raw to cleaned column names
+_registry = {}
+
+
+def sniff_encoding(sample):
+    """Guess the encoding of a file from its first bytes"""
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    try:
+        # Not final: the sample may end in the middle of a character
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def clean_column(name):
+    """Strip stray BOMs and whitespace from a header cell"""
+    name = str(name).strip()
+    for prefix in BOM_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):].strip()
+    return name
+
+
+def sniff_csv(path, markers=HEADER_MARKERS, aliases=COLUMN_ALIASES, sample_bytes=SAMPLE_BYTES):
+    """Detect the encoding, header row and column mapping of a CSV file
+
+    Only the first ``sample_bytes`` of the file are read. Returns a dict
+    with ``encoding``, ``header_row`` (lines to skip before the header),
+    ``columns`` (raw -> canonical names, renamed through ``aliases``) and
+    the header ``fingerprint``.
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(sample_bytes)
+
+    encoding = sniff_encoding(sample)
+    lines = sample.decode(encoding, errors='replace').splitlines()
+
+    header_row = 0
+    for i, line in enumerate(lines):
+        if any(marker in line for marker in markers):
+            header_row = i
+            break
+
+    header_line = lines[header_row] if lines else ''
+    fingerprint = hashlib.sha1(f'{encoding}\n{header_line}'.encode('utf-8')).hexdigest()
+
+    cleaned = _registry.get(fingerprint)
+    if cleaned is None:
+        raw_columns = next(csv.reader(io.StringIO(header_line)), [])
+        cleaned = {raw: clean_column(raw) for raw in raw_columns}
+        _registry[fingerprint] = cleaned
+
+    return {
+        'encoding': encoding,
+        'header_row': header_row,
+        'columns': {raw: aliases.get(name, name) for raw, name in cleaned.items()},
+        'fingerprint': fingerprint,
+    }
+
+
+def read_csv_kwargs(schema):
+    """pandas.read_csv arguments that parse a file described by ``schema``"""
+    kwargs = {'encoding': schema['encoding'], 'skiprows': schema['header_row'], 'header': 0}
+    if schema['encoding'] == 'cp1252':
+        # A sniffed legacy encoding may still meet an undefined byte later on
+        kwargs['encoding_errors'] = 'replace'
+    return kwargs
+
+
+def rename_columns(df, schema):
+    """Apply the schema's canonical column names to a parsed frame"""
+    return df.rename(columns=schema['columns'])
+
+
+def read_csv(path, markers=HEADER_MARKERS, aliases=COLUMN_ALIASES, **kwargs):
+    """Sniff and parse a CSV in one pass, returning canonical column names"""
+    schema = sniff_csv(path, markers, aliases)
+    df = pd.read_csv(path, **read_csv_kwargs(schema), **kwargs)
+    return rename_columns(df, schema)
+
+
+def registered_schemas():
+    """The header layouts seen so far in this process"""
+    return dict(_registry)
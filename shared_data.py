@@ -0,0 +1,76 @@
+"""
+One read-only copy of the shot data per process, shared by every session.
+
+``load_dataset`` reads the shots of a data version once, from the
+memory-mapped snapshot when the version names one and from the Parquet
+store otherwise, and indexes them with ``shot_index``. The dashboard keeps
+the result in a resource cache, so concurrent sessions all reference the
+same frame, index and rollups instead of each unpickling a copy.
+
+Nothing here is modified after it is built; pandas 3 (the minimum in
+requirements.txt) always copies on write, so a session that did write to
+a view would get its own copy rather than change the shared data.
+``session_view`` hands out the filtered shots as a zero-copy slice whenever
+the filters select a contiguous run of rows (a date range, as the shots
+are sorted by date) and reports which part of the view the session holds
+privately. Club and ball-speed filters select scattered rows, which are
+taken into a per-session frame holding only those rows.
+
+The shared frame deliberately keeps the compact NumPy dtypes of
+``shot_schema`` (float32, int16, categoricals) rather than Arrow-backed
+ones: they are smaller, numeric columns of a snapshot stay backed by the
+memory-mapped Arrow file anyway, and the charts and filters all operate
+on NumPy arrays.
+"""
+import rollups
+import shot_store
+import snapshot
+from shot_index import build_shot_index, select_positions
+from shot_schema import compact_shots
+
+
+def load_dataset(data_version, compact=True):
+    """Shots, filter index and rollups of a data version
+
+    ``compact`` applies to the shot store only; snapshots are compacted
+    when they are built.
+    """
+    if snapshot.is_snapshot_version(data_version):
+        shots = snapshot.load_snapshot_shots()
+        shot_rollups = snapshot.load_snapshot_rollups()
+    else:
+        shots = shot_store.read_shots()
+        if compact:
+            shots = compact_shots(shots)
+        shot_rollups = rollups.load_rollups()
+
+    index = build_shot_index(shots)
+    return {
+        'version': data_version,
+        'index': index,
+        'rollups': shot_rollups,
+        'memory_mb': _memory_mb(index['shots']) + _memory_mb(shot_rollups),
+    }
+
+
+def _memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def session_view(dataset, date_range=None, clubs=None, ball_speed=None):
+    """The shots matching the filters and the session's memory footprint
+
+    Returns ``(view, footprint)``. ``footprint`` has the view's ``rows``,
+    the MB it ``shared_mb`` with the dataset and the ``private_mb`` the
+    session holds on its own: a contiguous date range is an ``iloc`` slice
+    of the shared frame, any other selection is taken into a new frame.
+    """
+    shots = dataset['index']['shots']
+    positions = select_positions(dataset['index'], date_range, clubs, ball_speed)
+    if isinstance(positions, tuple):
+        view = shots.iloc[positions[0]:positions[1]]
+        shared, private = _memory_mb(view), 0.0
+    else:
+        view = shots.take(positions)
+        shared, private = 0.0, _memory_mb(view) + positions.nbytes / 2**20
+    return view, {'rows': len(view), 'shared_mb': shared, 'private_mb': private}
@@ -0,0 +1,137 @@
+"""
+In-memory filter index over a player's shots.
+
+``build_shot_index`` sorts the shots by date once per data version and
+precomputes what the sidebar filters need: the sorted dates for a
+``searchsorted`` range lookup, one boolean row bitmap per club and the
+argsort of ball speed. ``filter_shots`` intersects those into a single set of
+row positions and takes the rows once, returning a zero-copy slice when the
+filters select a contiguous date range.
+
+The index also holds a descending sort permutation for each column of the
+raw shot table, so a sorted page of any filtered view is a slice of
+``sorted_positions`` rather than a sort of the whole view.
+"""
+import numpy as np
+import pandas as pd
+
+# Columns the raw shot table can be sorted by (descending)
+SORT_COLUMNS = ['Shot Created Date', 'Carry (yds)', 'Ball Speed (mph)', 'Club Name']
+
+
+def build_shot_index(df):
+    """Sort shots by date and build the filter indexes and sort permutations"""
+    sort_by = [col for col in ('Date', 'Shot Created Date') if col in df.columns]
+    # Presorted shots (a memory-mapped snapshot) are used without a copy
+    if sort_by and not _is_sorted(df, sort_by):
+        df = df.sort_values(sort_by, kind='stable')
+    shots = df.reset_index(drop=True)
+
+    # Dates may be datetime.date objects or a categorical of them
+    dates = pd.to_datetime(pd.Series(np.asarray(shots['Date'], dtype=object))).to_numpy('datetime64[D]')
+
+    clubs = shots['Club Name'].astype('category')
+    club_codes = clubs.cat.codes.to_numpy()
+    club_bitmaps = {
+        club: club_codes == code
+        for code, club in enumerate(clubs.cat.categories)
+        if (club_codes == code).any()
+    }
+
+    speeds = pd.to_numeric(shots['Ball Speed (mph)'], errors='coerce').to_numpy(dtype=float)
+    position_dtype = np.int32 if len(shots) < 2**31 else np.int64
+    speed_order = np.argsort(speeds, kind='stable').astype(position_dtype)
+
+    # Same order as sort_values(ascending=False): missing values last
+    sort_orders = {
+        col: shots[col].reset_index(drop=True).sort_values(ascending=False, kind='stable')
+        .index.to_numpy().astype(position_dtype)
+        for col in SORT_COLUMNS if col in shots.columns
+    }
+
+    return {
+        'shots': shots,
+        'dates': dates,
+        'clubs': club_bitmaps,
+        'speed_order': speed_order,
+        'speeds': speeds[speed_order],
+        'sort_orders': sort_orders,
+    }
+
+
+def _is_sorted(df, columns):
+    """Whether ``df`` is already in ``sort_values(columns)`` order"""
+    if df[columns].isna().any(axis=None):
+        return False
+    order = pd.MultiIndex.from_frame(df[columns]) if len(columns) > 1 else pd.Index(df[columns[0]])
+    return order.is_monotonic_increasing
+
+
+def select_positions(index, date_range=None, clubs=None, ball_speed=None):
+    """Row positions matching the filters, as ``(start, stop)`` or an array
+
+    The date range is a ``searchsorted`` lookup on the sorted dates; club and
+    ball-speed filters are applied only inside it. Returns a ``(start,
+    stop)`` tuple when every row in the date range matches.
+    """
+    dates = index['dates']
+    start, stop = 0, len(dates)
+    if date_range is not None:
+        low, high = date_range
+        if low is not None:
+            start = np.searchsorted(dates, np.datetime64(pd.Timestamp(low).date(), 'D'), side='left')
+        if high is not None:
+            stop = np.searchsorted(dates, np.datetime64(pd.Timestamp(high).date(), 'D'), side='right')
+    stop = max(start, stop)
+
+    mask = None
+    if clubs is not None:
+        mask = np.zeros(stop - start, dtype=bool)
+        for club in clubs:
+            bitmap = index['clubs'].get(club)
+            if bitmap is not None:
+                mask |= bitmap[start:stop]
+
+    if ball_speed is not None:
+        low, high = ball_speed
+        speeds = index['speeds']
+        first = 0 if low is None else np.searchsorted(speeds, float(low), side='left')
+        last = np.searchsorted(speeds, float(high), side='right') if high is not None else len(speeds)
+        rows = index['speed_order'][first:last]
+        rows = rows[(rows >= start) & (rows < stop)] - start
+        in_speed = np.zeros(stop - start, dtype=bool)
+        in_speed[rows] = True
+        mask = in_speed if mask is None else mask & in_speed
+
+    if mask is None or mask.all():
+        return start, stop
+    return start + np.flatnonzero(mask)
+
+
+def filter_shots(index, date_range=None, clubs=None, ball_speed=None):
+    """The indexed shots matching dashboard-style filters
+
+    ``date_range`` and ``ball_speed`` are inclusive ``(low, high)`` tuples
+    (either end may be None) and ``clubs`` is an iterable of club names.
+    """
+    positions = select_positions(index, date_range, clubs, ball_speed)
+    if isinstance(positions, tuple):
+        return index['shots'].iloc[positions[0]:positions[1]]
+    return index['shots'].take(positions)
+
+
+def sorted_positions(index, positions, sort_by):
+    """Row positions from ``select_positions`` in descending ``sort_by`` order
+
+    Filters the precomputed permutation instead of sorting, in one pass.
+    """
+    order = index['sort_orders'][sort_by]
+    if isinstance(positions, tuple):
+        start, stop = positions
+        if start == 0 and stop == len(order):
+            return order
+        return order[(order >= start) & (order < stop)]
+
+    selected = np.zeros(len(order), dtype=bool)
+    selected[positions] = True
+    return order[selected[order]]
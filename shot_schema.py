@@ -0,0 +1,101 @@
+"""
+Memory-compact dtypes for shot DataFrames.
+
+Launch monitor metrics are recorded with one or two decimals, so float64
+wastes half its bytes, and text columns such as 'Club Type' or
+'Session_File' repeat a handful of strings for every shot.
+``compact_shots`` downcasts numeric columns to int16/float32 where that
+loses no precision and stores repetitive columns as categoricals;
+``memory_report`` shows what each column costs and ``display_shots``
+widens float32 columns back for tables shown to the user.
+"""
+import numpy as np
+import pandas as pd
+
+# Largest rounding error tolerated when narrowing to float32; metrics are
+# reported to at most two decimals
+FLOAT32_TOLERANCE = 5e-3
+
+# Text columns are stored as categoricals when their distinct values are at
+# most this share of the rows
+CATEGORY_MAX_RATIO = 0.5
+
+
+def downcast_numeric(series):
+    """Narrow a numeric Series to int16 or float32 when no precision is lost
+
+    int16 is only used for columns without missing values so the result
+    stays a plain NumPy dtype.
+    """
+    if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        return series
+
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    present = values[~np.isnan(values)]
+    info = np.iinfo(np.int16)
+
+    if (len(present) == len(values) > 0 and np.all(present == np.round(present))
+            and present.min() >= info.min and present.max() <= info.max):
+        return pd.Series(values.astype(np.int16), index=series.index, name=series.name)
+
+    if series.dtype == np.float32:
+        return series
+
+    narrowed = values.astype(np.float32)
+    if np.max(np.abs(narrowed[~np.isnan(values)] - present), initial=0.0) <= FLOAT32_TOLERANCE:
+        return pd.Series(narrowed, index=series.index, name=series.name)
+
+    return series
+
+
+def compact_shots(df):
+    """Return a copy of ``df`` with compact numeric and categorical dtypes"""
+    df = df.copy()
+    rows = max(len(df), 1)
+
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            continue
+        if pd.api.types.is_numeric_dtype(series):
+            df[col] = downcast_numeric(series)
+        elif series.nunique(dropna=True) <= rows * CATEGORY_MAX_RATIO:
+            df[col] = series.astype(_category_dtype(series))
+
+    return df
+
+
+def _category_dtype(series):
+    """Ordered categories when the values sort (keeps min/max working on dates)"""
+    try:
+        categories = sorted(series.dropna().unique())
+    except TypeError:
+        return pd.CategoricalDtype()
+    return pd.CategoricalDtype(categories, ordered=True)
+
+
+def display_shots(df):
+    """Copy of ``df`` with float32 columns as the float64 values they stand for
+
+    A float32 such as 75.4 is really 75.40000153 and is shown that way;
+    going through its shortest decimal text gives back 75.4. Meant for the
+    rows on screen, not the whole dataset.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == np.float32:
+            df[col] = df[col].to_numpy().astype(str).astype(np.float64)
+    return df
+
+
+def memory_report(df):
+    """Per-column dtype and memory usage, largest first"""
+    usage = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'Column': usage.index,
+        'Dtype': [str(df[col].dtype) for col in usage.index],
+        'Memory (KB)': (usage.to_numpy() / 1024).round(1),
+    })
+    return report.sort_values('Memory (KB)', ascending=False).reset_index(drop=True)
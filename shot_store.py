@@ -0,0 +1,282 @@
+"""
+Typed, partitioned Parquet store for cleaned shot data.
+
+Shots are written as a hive-partitioned dataset laid out as
+``player=<name>/Date=<yyyy-mm-dd>/Club Name=<club>/<source>-<n>.parquet``,
+one file per source (session file) per partition. Reads push date and club
+filters down to partition pruning and ball-speed filters down to Parquet
+row-group statistics, so a filtered view only decodes the files and row
+groups it needs.
+"""
+import hashlib
+import os
+import shutil
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from clubs import CLUB_DTYPE, sort_clubs
+
+# Folder holding sessions/ and data/; run_dashboard.py sets it per dashboard
+DATA_ROOT = os.path.abspath(os.environ.get('GOLF_DATA_DIR', os.path.dirname(os.path.abspath(__file__))))
+STORE_DIR = os.path.join(DATA_ROOT, 'data', 'shots')
+DEFAULT_PLAYER = os.environ.get('GOLF_PLAYER', 'default')
+ROWS_PER_GROUP = 4096
+
+PARTITION_SCHEMA = pa.schema([
+    ('player', pa.string()),
+    ('Date', pa.date32()),
+    ('Club Name', pa.string()),
+])
+
+SHOT_SCHEMA = pa.schema([
+    ('Shot Number', pa.int64()),
+    ('Club Type', pa.string()),
+    ('Shot Created Date', pa.timestamp('ns')),
+    ('Ball Speed (mph)', pa.float64()),
+    ('Push/Pull (deg L-/R+)', pa.float64()),
+    ('Launch Angle (deg)', pa.float64()),
+    ('Back Spin (rpm)', pa.float64()),
+    ('Side Spin (rpm L-/R+)', pa.float64()),
+    ('Total Spin (rpm)', pa.float64()),
+    ('Carry (yds)', pa.float64()),
+    ('Total Distance (yds)', pa.float64()),
+    ('Offline (yds L-/R+)', pa.float64()),
+    ('Peak Height (yds)', pa.float64()),
+    ('Descent Angle (deg)', pa.float64()),
+    ('Club Speed (mph)', pa.float64()),
+    ('Club Speed at Impact Location (mph)', pa.float64()),
+    ('Efficiency', pa.float64()),
+    ('Angle of Attack (deg)', pa.float64()),
+    ('Club Path (deg out-in-/in-out+)', pa.float64()),
+    ('Face to Target (deg closed-/open+)', pa.float64()),
+    ('Lie (deg toe down-/toe up+)', pa.float64()),
+    ('Loft (deg)', pa.float64()),
+    ('Face Impact Horizontal (mm toe-/heel+)', pa.float64()),
+    ('Face Impact Vertical (mm low-/high+)', pa.float64()),
+    ('Closure Rate (deg/sec)', pa.float64()),
+    ('Roll', pa.float64()),
+    ('Spin_Efficiency', pa.float64()),
+    ('Session_File', pa.string()),
+])
+
+# Bumped whenever SHOT_SCHEMA gains columns computed at ingest, so files
+# stored under an older schema are ingested again
+SCHEMA_VERSION = 2
+
+# Column order handed back to callers: partition keys re-inserted where the
+# session CSVs have them
+COLUMN_ORDER = (
+    ['Shot Number', 'Club Name'] + SHOT_SCHEMA.names[1:] + ['Date', 'player']
+)
+
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+
+def source_token(source):
+    """Return the filesystem-safe file prefix used for a source's files"""
+    return hashlib.sha1(str(source).encode('utf-8')).hexdigest()[:16]
+
+
+def to_shot_table(df, player=DEFAULT_PLAYER):
+    """Conform a shot DataFrame to the store schema as an Arrow table
+
+    Missing columns are filled with nulls, values are coerced to their
+    schema type and columns outside the schema are dropped.
+    """
+    df = df.copy()
+    if 'Shot Created Date' not in df.columns:
+        df['Shot Created Date'] = pd.NaT
+    df['Shot Created Date'] = pd.to_datetime(df['Shot Created Date'], errors='coerce')
+    if 'Date' not in df.columns:
+        df['Date'] = df['Shot Created Date'].dt.date
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce').dt.date
+    df['player'] = player
+    df['Club Name'] = df['Club Name'].astype(str)
+
+    # Rows without a date cannot be placed in a partition
+    df = df.dropna(subset=['Date'])
+
+    columns = {}
+    for field in SHOT_SCHEMA:
+        if field.name not in df.columns:
+            columns[field.name] = pa.nulls(len(df), field.type)
+        elif pa.types.is_string(field.type):
+            columns[field.name] = pa.array(df[field.name].astype('string'), type=field.type, from_pandas=True)
+        elif pa.types.is_timestamp(field.type):
+            columns[field.name] = pa.array(df[field.name], type=field.type, from_pandas=True)
+        else:
+            values = pd.to_numeric(df[field.name], errors='coerce')
+            if pa.types.is_integer(field.type):
+                values = values.round().astype('Int64')
+            columns[field.name] = pa.array(values, type=field.type, from_pandas=True)
+
+    for field in PARTITION_SCHEMA:
+        columns[field.name] = pa.array(df[field.name], type=field.type, from_pandas=True)
+
+    return pa.table(columns)
+
+
+def delete_sources(sources, player=DEFAULT_PLAYER, store_dir=STORE_DIR):
+    """Remove every file written for the given sources"""
+    player_dir = os.path.join(store_dir, f'player={player}')
+    if not os.path.isdir(player_dir):
+        return
+
+    prefixes = tuple(source_token(source) + '-' for source in sources)
+    if not prefixes:
+        return
+
+    for root, dirs, files in os.walk(player_dir, topdown=False):
+        for name in files:
+            if name.startswith(prefixes):
+                os.remove(os.path.join(root, name))
+        if root != player_dir and not os.listdir(root):
+            os.rmdir(root)
+
+
+def write_shots(df, player=DEFAULT_PLAYER, store_dir=STORE_DIR, source=None, replace=True, part=0):
+    """Write cleaned shots to the store, replacing earlier writes of a source
+
+    Rows are grouped by ``source`` or, when it is not given, by their
+    ``Session_File`` so each session file owns its own Parquet files. Pass
+    ``replace=False`` for sources known to be new to skip the store walk,
+    and a distinct ``part`` for each chunk appended to the same source.
+    """
+    if df.empty:
+        return
+
+    if source is not None:
+        groups = [(source, df)]
+    else:
+        groups = df.groupby('Session_File', sort=False)
+
+    for group_source, group in groups:
+        if replace:
+            delete_sources([group_source], player, store_dir)
+        table = to_shot_table(group, player)
+        if table.num_rows == 0:
+            continue
+        # Sorting by ball speed keeps row-group statistics tight for pushdown
+        table = table.sort_by('Ball Speed (mph)')
+        ds.write_dataset(
+            table, store_dir,
+            format='parquet',
+            partitioning=PARTITIONING,
+            basename_template=f'{source_token(group_source)}-{part}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            max_rows_per_group=ROWS_PER_GROUP,
+            min_rows_per_group=min(ROWS_PER_GROUP, table.num_rows),
+        )
+
+
+def has_player(player=DEFAULT_PLAYER, store_dir=STORE_DIR):
+    """Return whether any shots are stored for a player"""
+    return os.path.isdir(os.path.join(store_dir, f'player={player}'))
+
+
+def clear_player(player=DEFAULT_PLAYER, store_dir=STORE_DIR):
+    """Delete all stored shots for a player"""
+    shutil.rmtree(os.path.join(store_dir, f'player={player}'), ignore_errors=True)
+
+
+def open_dataset(store_dir=STORE_DIR):
+    """Open the store as a pyarrow dataset"""
+    schema = pa.unify_schemas([SHOT_SCHEMA, PARTITION_SCHEMA])
+    return ds.dataset(store_dir, format='parquet', partitioning=PARTITIONING, schema=schema)
+
+
+def build_filter(player=DEFAULT_PLAYER, date_range=None, clubs=None, ball_speed=None):
+    """Build a dataset filter expression from dashboard-style filters"""
+    expression = ds.field('player') == player
+
+    if date_range is not None:
+        start, end = date_range
+        if start is not None:
+            expression &= ds.field('Date') >= pa.scalar(_as_date(start), pa.date32())
+        if end is not None:
+            expression &= ds.field('Date') <= pa.scalar(_as_date(end), pa.date32())
+
+    if clubs is not None:
+        expression &= ds.field('Club Name').isin(list(clubs))
+
+    if ball_speed is not None:
+        low, high = ball_speed
+        if low is not None:
+            expression &= ds.field('Ball Speed (mph)') >= float(low)
+        if high is not None:
+            expression &= ds.field('Ball Speed (mph)') <= float(high)
+
+    return expression
+
+
+def read_table(player=DEFAULT_PLAYER, date_range=None, clubs=None, ball_speed=None,
+               columns=None, store_dir=STORE_DIR):
+    """Read the shots matching the filters as an Arrow table"""
+    if not has_player(player, store_dir):
+        return to_shot_table(pd.DataFrame(columns=['Club Name']), player)
+
+    dataset = open_dataset(store_dir)
+    expression = build_filter(player, date_range, clubs, ball_speed)
+    return dataset.to_table(columns=columns, filter=expression)
+
+
+def read_shots(player=DEFAULT_PLAYER, date_range=None, clubs=None, ball_speed=None,
+               columns=None, store_dir=STORE_DIR):
+    """Read the shots matching the filters as a DataFrame
+
+    ``date_range`` and ``ball_speed`` are inclusive ``(low, high)`` tuples
+    (either end may be None) and ``clubs`` is an iterable of club names.
+    """
+    table = read_table(player, date_range, clubs, ball_speed, columns, store_dir)
+    df = table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+    if 'Club Name' in df.columns:
+        df['Club Name'] = df['Club Name'].astype(CLUB_DTYPE)
+    ordered = [col for col in COLUMN_ORDER if col in df.columns]
+    return df[ordered].reset_index(drop=True)
+
+
+def describe_store(player=DEFAULT_PLAYER, store_dir=STORE_DIR):
+    """Summarize a player's shots from partition paths and Parquet metadata
+
+    Returns the stored dates, clubs and ball-speed bounds without reading
+    any column data.
+    """
+    summary = {'dates': [], 'clubs': [], 'ball_speed': (None, None), 'rows': 0}
+    if not has_player(player, store_dir):
+        return summary
+
+    dataset = ds.dataset(os.path.join(store_dir, f'player={player}'), format='parquet',
+                         partitioning=ds.partitioning(PARTITION_SCHEMA.remove(0), flavor='hive'))
+    dates, clubs = set(), set()
+    low, high = None, None
+    for fragment in dataset.get_fragments():
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        dates.add(keys['Date'])
+        clubs.add(keys['Club Name'])
+
+        metadata = fragment.metadata
+        summary['rows'] += metadata.num_rows
+        speed_col = metadata.schema.to_arrow_schema().get_field_index('Ball Speed (mph)')
+        if speed_col < 0:
+            continue
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(speed_col).statistics
+            if stats is None or not stats.has_min_max:
+                continue
+            low = stats.min if low is None else min(low, stats.min)
+            high = stats.max if high is None else max(high, stats.max)
+
+    summary['dates'] = sorted(dates)
+    summary['clubs'] = sort_clubs(clubs)
+    summary['ball_speed'] = (low, high)
+    return summary
+
+
+def _as_date(value):
+    """Coerce a date-like value to a datetime.date"""
+    if type(value) is date:
+        return value
+    return pd.Timestamp(value).date()
@@ -0,0 +1,215 @@
+"""
+Prebuilt snapshot of the cleaned shot data for fast dashboard cold starts.
+
+``python snapshot.py build`` brings the shot store up to date with the
+sessions folder and writes everything the dashboard needs before its first
+paint to ``data/snapshot/``:
+
+- ``shots.arrow``: all shots, sorted by date, in the dashboard's dtypes, as an
+  uncompressed Arrow IPC file that is memory-mapped at launch
+- ``rollups.parquet``: the per-session, per-club rollups
+- ``snapshot.json``: the sidebar summary and the fingerprints of the session
+  files the snapshot was built from
+
+At launch the dashboard only stats the session files; if they still match
+the snapshot it skips ingest entirely, so the first user after a deploy or
+restart does not wait for the sessions to be parsed.
+
+``python snapshot.py bench`` measures time-to-first-render of the dashboard
+in fresh processes, with and without the snapshot.
+"""
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+import ingest
+import rollups
+import shot_store
+from shot_schema import compact_shots
+
+SNAPSHOT_DIR = os.path.join(shot_store.DATA_ROOT, 'data', 'snapshot')
+SHOTS_FILE = 'shots.arrow'
+ROLLUPS_FILE = 'rollups.parquet'
+META_FILE = 'snapshot.json'
+
+
+def snapshot_fingerprints(sessions_dir, previous=None):
+    """Fingerprints of the session CSVs, reusing hashes of unchanged files"""
+    previous = previous or {}
+    return {
+        filename: ingest.file_fingerprint(os.path.join(sessions_dir, filename), previous.get(filename))
+        for filename in sorted(os.listdir(sessions_dir)) if filename.endswith('.csv')
+    }
+
+
+def build_snapshot(sessions_dir='./sessions', player=shot_store.DEFAULT_PLAYER,
+                   store_dir=shot_store.STORE_DIR, data_dir=ingest.DATA_DIR,
+                   snapshot_dir=SNAPSHOT_DIR, compact=True):
+    """Ingest the sessions folder and write a snapshot of the result
+
+    Returns the snapshot metadata.
+    """
+    report = ingest.ingest_sessions(sessions_dir, data_dir=data_dir, player=player, store_dir=store_dir)
+
+    df = shot_store.read_shots(player, store_dir=store_dir)
+    if compact:
+        df = compact_shots(df)
+    df = df.sort_values(['Date', 'Shot Created Date'], kind='stable').reset_index(drop=True)
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = os.path.join(snapshot_dir, SHOTS_FILE + '.tmp')
+    with pa.OSFile(tmp_path, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, os.path.join(snapshot_dir, SHOTS_FILE))
+
+    rollups.write_rollups_file(rollups.load_rollups(player, store_dir),
+                               os.path.join(snapshot_dir, ROLLUPS_FILE))
+
+    # Files that failed to load are recorded too, so they do not make the
+    # snapshot look stale on every launch
+    fingerprints = snapshot_fingerprints(sessions_dir, ingest.load_manifest(data_dir))
+    summary = shot_store.describe_store(player, store_dir)
+    meta = {
+        'version': 'snapshot-' + hashlib.sha1(
+            json.dumps(fingerprints, sort_keys=True).encode('utf-8')).hexdigest()[:16],
+        'player': player,
+        'compact': compact,
+        'built': datetime.now().isoformat(timespec='seconds'),
+        'fingerprints': fingerprints,
+        'errors': report['errors'],
+        'summary': {
+            'dates': [d.isoformat() for d in summary['dates']],
+            'clubs': summary['clubs'],
+            'ball_speed': summary['ball_speed'],
+            'rows': summary['rows'],
+        },
+    }
+    tmp_path = os.path.join(snapshot_dir, META_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(snapshot_dir, META_FILE))
+    return meta
+
+
+def current_snapshot(sessions_dir='./sessions', player=shot_store.DEFAULT_PLAYER,
+                     snapshot_dir=SNAPSHOT_DIR, compact=True):
+    """Metadata of the snapshot if it matches the session files, else None
+
+    The session files and the store schema version must match the ones
+    the snapshot was built from; only file sizes and mtimes are checked
+    unless a file changed on disk.
+    The summary's dates are returned as ``datetime.date`` objects.
+    """
+    path = os.path.join(snapshot_dir, META_FILE)
+    if not os.path.exists(path) or not os.path.isdir(sessions_dir):
+        return None
+    with open(path) as f:
+        meta = json.load(f)
+    if meta['player'] != player or meta['compact'] != compact:
+        return None
+
+    # A snapshot built by another store schema version is stale even when
+    # the session files are unchanged
+    fingerprints = snapshot_fingerprints(sessions_dir, meta['fingerprints'])
+    if {name: (fp['sha256'], fp['schema']) for name, fp in fingerprints.items()} != \
+            {name: (fp['sha256'], fp.get('schema')) for name, fp in meta['fingerprints'].items()}:
+        return None
+
+    meta['summary']['dates'] = [date.fromisoformat(d) for d in meta['summary']['dates']]
+    meta['summary']['ball_speed'] = tuple(meta['summary']['ball_speed'])
+    return meta
+
+
+def is_snapshot_version(data_version):
+    """Whether a data version names a snapshot rather than the shot store"""
+    return isinstance(data_version, str) and data_version.startswith('snapshot-')
+
+
+def load_snapshot_shots(snapshot_dir=SNAPSHOT_DIR):
+    """Memory-map the snapshot's shots and return them as a DataFrame
+
+    Numeric columns without missing values stay backed by the mapped file.
+    """
+    source = pa.memory_map(os.path.join(snapshot_dir, SHOTS_FILE))
+    table = ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def load_snapshot_rollups(snapshot_dir=SNAPSHOT_DIR):
+    """The rollups saved with the snapshot"""
+    return rollups.read_rollups_file(os.path.join(snapshot_dir, ROLLUPS_FILE))
+
+
+# Run in a fresh interpreter per measurement: imports, first script run
+BENCH_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=600).run()
+print(time.perf_counter() - start, len(at.exception))
+"""
+
+
+def bench_startup(runs=3, dashboard='dashboard.py'):
+    """Time-to-first-render of the dashboard with and without the snapshot
+
+    Each run starts a new Python process, so module imports are included.
+    Returns the median seconds per mode.
+    """
+    dashboard = os.path.abspath(dashboard)
+    results = {}
+    for mode, use_snapshot in (('snapshot', '1'), ('store', '0')):
+        env = dict(os.environ, GOLF_USE_SNAPSHOT=use_snapshot)
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            out = subprocess.run([sys.executable, '-c', BENCH_SCRIPT, dashboard], env=env,
+                                 cwd=os.path.dirname(dashboard), capture_output=True, text=True, check=True)
+            first_render, errors = out.stdout.split()[-2:]
+            if int(errors):
+                raise RuntimeError(f"dashboard raised {errors} exception(s) in {mode} mode")
+            timings.append((time.perf_counter() - start, float(first_render)))
+        results[mode] = {
+            'process_s': statistics.median(t[0] for t in timings),
+            'first_render_s': statistics.median(t[1] for t in timings),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or benchmark the dashboard data snapshot")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="ingest the sessions folder and write the snapshot")
+    build.add_argument('--sessions-dir', default='./sessions')
+    build.add_argument('--player', default=shot_store.DEFAULT_PLAYER)
+    build.add_argument('--full-schema', action='store_true',
+                       help="keep the store's dtypes (for GOLF_COMPACT_SCHEMA=0)")
+
+    bench = commands.add_parser('bench', help="measure dashboard time-to-first-render")
+    bench.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        meta = build_snapshot(args.sessions_dir, args.player, compact=not args.full_schema)
+        print(f"Snapshot {meta['version']}: {meta['summary']['rows']} shots "
+              f"in {time.perf_counter() - start:.1f}s")
+    else:
+        for mode, timing in bench_startup(args.runs).items():
+            print(f"{mode:>8}: first render {timing['first_render_s']:.2f}s, "
+                  f"process total {timing['process_s']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,127 @@
+import os
+import sys
+
+import numpy as np
+import plotly.express as px
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 
-# Load the data
-all_shots_df = pd.read_csv('data/formatted_all_rounds_data.csv', parse_dates=['Date'])
+# Shared data modules live at the project root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import rollups
+from charts import scatter_figure
+from clubs import sort_clubs
+from figure_cache import cached_figure
+from round_data import ROUNDS_FILE, filter_rounds, load_round_dataset, rounds_version
+from shot_schema import display_shots
+
+# Keep the resident round shots in compact dtypes (float32/int16, categoricals)
+COMPACT_SCHEMA = os.environ.get('GOLF_COMPACT_SCHEMA', '1') != '0'
+
+@st.cache_resource(max_entries=1)
+def load_rounds(data_version):
+    """Round shots, filter index and rollups, built once per file version
+
+    Shared, unmodified, by every session and rerun.
+    """
+    return load_round_dataset(ROUNDS_FILE, compact=COMPACT_SCHEMA)
+
+def show_figure(figure_id, data_version, filters, build):
+    """Draw a figure from the figure cache, building it only on a miss"""
+    date_range, clubs, courses = filters
+    # The figure cache knows date and club filters; the course selection
+    # is part of the figure id
+    figure_id = (figure_id, courses and tuple(sorted(courses)))
+    fig = cached_figure(figure_id, data_version, (date_range, clubs, None), build)
+    st.plotly_chart(fig, use_container_width=True)
+
+def carry_histogram_figure(shots, bins=30):
+    """Carry histogram binned on the server, so only bin counts are sent"""
+    carry = shots['Carry (yds)'].to_numpy(dtype=float)
+    counts, edges = np.histogram(carry[~np.isnan(carry)], bins=bins)
+    fig = px.bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=counts,
+        labels={'x': 'Carry (yds)', 'y': 'Shots'}
+    )
+    fig.update_layout(bargap=0)
+    return fig
 
 # Set up the Streamlit app
 st.title('Golf Performance Dashboard')
 
+data_version = rounds_version()
+if data_version is None:
+    st.error(f"{ROUNDS_FILE} not found. Run src/FSX/main.py or round_parser.py to create it.")
+    st.stop()
+dataset = load_rounds(data_version)
+all_shots = dataset['index']['shots']
+dates = dataset['index']['dates']
+dates = dates[~np.isnat(dates)]
+
 # Sidebar Filters
 st.sidebar.header('Filter Data')
 
+# Course Selection
+courses = sorted(dataset['index']['courses'])
+selected_courses = st.sidebar.multiselect('Select Courses', courses, default=courses)
+
 # Date Range Filter
-start_date = st.sidebar.date_input('Start Date', all_shots_df['Date'].min())
-end_date = st.sidebar.date_input('End Date', all_shots_df['Date'].max())
+start_date = st.sidebar.date_input('Start Date', dates.min().astype(object))
+end_date = st.sidebar.date_input('End Date', dates.max().astype(object))
 
 # Club Selection
-clubs = all_shots_df['Club'].unique()
+clubs = sort_clubs(dataset['index']['clubs'])
 selected_clubs = st.sidebar.multiselect('Select Clubs', clubs, default=clubs)
 
-# Filter the data based on selections
-mask = (all_shots_df['Date'] >= pd.to_datetime(start_date)) & (all_shots_df['Date'] <= pd.to_datetime(end_date))
-mask &= all_shots_df['Club'].isin(selected_clubs)
-filtered_data = all_shots_df[mask]
+# Filters are index lookups; a full selection is no filter at all
+filters = (
+    (start_date, end_date),
+    tuple(selected_clubs) if set(selected_clubs) != set(clubs) else None,
+    tuple(selected_courses) if set(selected_courses) != set(courses) else None,
+)
+filtered_data, round_rollups = filter_rounds(dataset, *filters)
 
 # Display filtered data
 st.header('Filtered Shot Data')
-st.dataframe(filtered_data)
+st.dataframe(display_shots(filtered_data))
 
 # Key Metrics
 st.header('Key Performance Metrics')
 
-avg_carry = filtered_data['Carry (yds)'].mean()
-avg_total_distance = filtered_data['Total Distance (yds)'].mean()
-avg_ball_speed = filtered_data['Ball Speed'].mean()
+metrics = rollups.rollup_metrics(round_rollups)
+if not metrics:
+    st.warning('No shots match the selected filters.')
+    st.stop()
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric('Average Carry Distance (yds)', f"{metrics['avg_carry']:.1f}")
+col2.metric('Average Total Distance (yds)', f"{metrics['avg_total_distance']:.1f}")
+col3.metric('Average Ball Speed (mph)', f"{metrics['avg_ball_speed']:.1f}")
+col4.metric('Rounds', metrics['sessions_count'])
+
+# Rounds in the selection
+st.header('Rounds')
+rounds = dataset['rounds']
+st.dataframe(
+    rounds[rounds['Round'].isin(round_rollups['Session_File'])].drop(columns='Round'),
+    hide_index=True
+)
 
-col1, col2, col3 = st.columns(3)
-col1.metric('Average Carry Distance (yds)', f"{avg_carry:.1f}")
-col2.metric('Average Total Distance (yds)', f"{avg_total_distance:.1f}")
-col3.metric('Average Ball Speed (mph)', f"{avg_ball_speed:.1f}")
+# Per-club summary from the round rollups
+st.header('Club Summary')
+st.dataframe(rollups.rollup_summary(round_rollups, {
+    'Carry (yds)': ['mean', 'std', 'count'],
+    'Total Distance (yds)': ['mean'],
+    'Ball Speed (mph)': ['mean'],
+}).round(1))
 
 # Visualization
 st.header('Carry Distance Distribution')
-fig, ax = plt.subplots()
-filtered_data['Carry (yds)'].hist(bins=30, ax=ax)
-st.pyplot(fig)
+show_figure('rounds-carry-histogram', data_version, filters,
+            lambda: carry_histogram_figure(filtered_data))
 
 # Scatter Plot of Carry vs. Ball Speed
 st.header('Carry Distance vs. Ball Speed')
-fig2, ax2 = plt.subplots()
-ax2.scatter(filtered_data['Ball Speed'], filtered_data['Carry (yds)'])
-ax2.set_xlabel('Ball Speed (mph)')
-ax2.set_ylabel('Carry Distance (yds)')
-st.pyplot(fig2)
+show_figure('rounds-carry-vs-speed', data_version, filters, lambda: scatter_figure(
+    filtered_data, 'Ball Speed (mph)', 'Carry (yds)', 'Carry Distance vs. Ball Speed', color='Club Name',
+    labels={'Carry (yds)': 'Carry Distance (yds)'}
+))
@@ -1,9 +1,15 @@
+from playwright.async_api import async_playwright
 from playwright.sync_api import sync_playwright
 import pandas as pd
+import argparse
+import asyncio
 import time
 import os
 from dotenv import load_dotenv
 
+from round_parser import convert_rounds_file
+from scrape_manifest import can_merge, load_manifest, merge_rows, pending_items, record_item, save_manifest
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -15,6 +21,19 @@ password = 'Otot#102991!'
 if not username or not password:
     raise ValueError("Username or password not found in environment variables.")
 
+FSX_URL = "https://fsxlive.foresightsports.com"
+
+# Round pages fetched at once, and the least time between two page loads
+SCRAPE_CONCURRENCY = int(os.environ.get('FSX_SCRAPE_CONCURRENCY', 4))
+SCRAPE_DELAY = float(os.environ.get('FSX_SCRAPE_DELAY', 0.5))
+
+ROUNDS_EXPORT = "all_rounds_data.csv"
+FORMATTED_ROUNDS = "data/formatted_all_rounds_data.csv"
+
+def round_listing(round_info):
+    """What the round list shows for a round; a change means it was edited"""
+    return {key: round_info[key] for key in ('Date', 'Course', 'Score')}
+
 def extract_shot_analysis_data(shot_analysis_container):
     """Extracts all shot analysis data from a given container"""
     shot_data = {}
@@ -62,8 +81,11 @@ def extract_shots_data(page):
 
     return all_shots_data
 
-def scrape_rounds(page):
-    """Scrape all rounds available on the main page"""
+def scrape_rounds(page, manifest=None):
+    """Scrape all rounds available on the main page
+
+    With a ``manifest``, rounds it already holds unchanged are skipped.
+    """
     rounds_data = []
 
     # Wait until the table with rounds is loaded
@@ -81,11 +103,14 @@ def scrape_rounds(page):
         course = round_row.query_selector("td:nth-child(2)").text_content().strip()
         score = round_row.query_selector("td:nth-child(4)").text_content().strip()
 
-        # Log the round details
-        print(f"Scraping round {i + 1} - Date: {date}, Course: {course}, Score: {score}")
-
         # Extract the `data-href` to navigate to the session page
         session_link = round_row.get_attribute("data-href")
+        listing = {'Date': date, 'Course': course, 'Score': score}
+        if manifest is not None and not pending_items(manifest, 'rounds', {session_link: listing}):
+            continue
+
+        # Log the round details
+        print(f"Scraping round {i + 1} - Date: {date}, Course: {course}, Score: {score}")
 
         if session_link:
             # Navigate to the session link (the round page)
@@ -93,11 +118,12 @@ def scrape_rounds(page):
             page.wait_for_selector("table.hole-shots-table")
 
             # Scrape the shots data
-            shots_data = extract_shots_data(page)
+            shots_data = extract_shots_data_batched(page)
             rounds_data.append({
                 'Date': date,
                 'Course': course,
                 'Score': score,
+                'Link': session_link,
                 'Shots': shots_data
             })
 
@@ -111,12 +137,10 @@ def scrape_rounds(page):
 
     return rounds_data
 
-with sync_playwright() as p:
-    browser = p.chromium.launch(headless=False)
-    page = browser.new_page()
-
+def login(page):
+    """Sign in to FSX Live on a sync page"""
     # Navigate to the login page
-    page.goto("https://fsxlive.foresightsports.com/")
+    page.goto(f"{FSX_URL}/")
     
     # Click sign-in button and login
     page.click("#sign-in-btn")
@@ -131,26 +155,286 @@ with sync_playwright() as p:
     page.click("button.btn-primary:has-text('SIGN IN')")
     page.wait_for_load_state("networkidle")
 
-    # Scrape the data from all rounds
-    rounds_data = scrape_rounds(page)
+async def login_async(page):
+    """Sign in to FSX Live on an async page"""
+    await page.goto(f"{FSX_URL}/")
+    await page.click("#sign-in-btn")
+    await page.fill("#sign-in-username", username)
+    await page.fill("#sign-in-password", password)
+    await page.wait_for_selector(".md-overlay", state="visible")
+    await page.evaluate("document.querySelector('.md-overlay').style.display = 'none'")
+    await page.click("button.btn-primary:has-text('SIGN IN')")
+    await page.wait_for_load_state("networkidle")
+
+async def collect_round_links(page):
+    """Date, course, score and round page link of every round in the list"""
+    await page.wait_for_selector("tr.row-link")
+    return await page.locator("tr.row-link").evaluate_all("""
+        rows => rows.map(r => ({
+            Date: r.querySelector('td:nth-child(1)').textContent.trim(),
+            Course: r.querySelector('td:nth-child(2)').textContent.trim(),
+            Score: r.querySelector('td:nth-child(4)').textContent.trim(),
+            href: r.getAttribute('data-href'),
+        }))
+    """)
+
+# Hole table columns, in cell order
+SHOT_COLUMNS = ['Shot Number', 'Club', 'Result', 'Carry (yds)', 'Total Distance (yds)', 'Offline (yds)']
+
+# Serializes every shot row of the hole tables, with its shot analysis, in
+# one in-page call; the same cells and text as extract_shots_data reads
+HOLE_SHOTS_JS = """
+rows => rows.map(row => {
+    const cells = [];
+    for (let i = 1; i <= %d; i++) {
+        const cell = row.querySelector(`td:nth-child(${i})`);
+        cells.push(cell ? cell.textContent.trim() : null);
+    }
+    let analysis = null;
+    const sibling = row.nextElementSibling;
+    if (sibling && sibling.classList.contains('shot-analysis')) {
+        const container = sibling.querySelector('.shot-analysis-data-container');
+        if (container) {
+            analysis = [];
+            for (const item of container.querySelectorAll('.shot-analysis-item')) {
+                const label = item.querySelector('.shot-analysis-item-label');
+                const data = item.querySelector('.shot-analysis-item-data');
+                if (label && data) {
+                    analysis.push([label.textContent.trim(), data.textContent.trim()]);
+                }
+            }
+        }
+    }
+    return {cells, analysis};
+})
+""" % len(SHOT_COLUMNS)
 
+SHOT_ROWS = "table.hole-shots-table tbody tr.shot-row"
+
+def parse_hole_shots(rows):
+    """Shot dicts, as extract_shots_data returns them, from HOLE_SHOTS_JS output"""
+    all_shots_data = []
+    for row in rows:
+        shot_data = dict(zip(SHOT_COLUMNS, row['cells']))
+        shot_data.update(row['analysis'] or [])
+        all_shots_data.append(shot_data)
+    return all_shots_data
+
+def extract_shots_data_batched(page):
+    """Extracts all the shots data including their analysis in one round trip"""
+    return parse_hole_shots(page.locator(SHOT_ROWS).evaluate_all(HOLE_SHOTS_JS))
+
+async def extract_shots_data_async(page):
+    """Async ``extract_shots_data_batched``"""
+    return parse_hole_shots(await page.locator(SHOT_ROWS).evaluate_all(HOLE_SHOTS_JS))
+
+def benchmark_extraction(page, runs=5):
+    """Time per-cell and batched extraction of the loaded round page
+
+    Returns the median seconds of each and whether they read the same shots.
+    """
+    timings = {}
+    results = {}
+    for name, extract in (('per-cell', extract_shots_data), ('batched', extract_shots_data_batched)):
+        runs_s = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            results[name] = extract(page)
+            runs_s.append(time.perf_counter() - start)
+        timings[name] = sorted(runs_s)[len(runs_s) // 2]
+    return {
+        'shots': len(results['batched']),
+        'per_cell_s': timings['per-cell'],
+        'batched_s': timings['batched'],
+        'identical': results['per-cell'] == results['batched'],
+    }
+
+def rate_limiter(delay):
+    """Async callable that spaces successive calls at least ``delay`` seconds apart"""
+    lock = asyncio.Lock()
+    next_start = 0.0
+
+    async def wait():
+        nonlocal next_start
+        async with lock:
+            now = asyncio.get_running_loop().time()
+            if next_start > now:
+                await asyncio.sleep(next_start - now)
+            next_start = max(now, next_start) + delay
+
+    return wait
+
+async def scrape_rounds_async(context, page, concurrency=SCRAPE_CONCURRENCY, delay=SCRAPE_DELAY, retries=2,
+                              manifest=None):
+    """Scrape all rounds with a bounded pool of pages in one signed-in context
+
+    The round links are collected from the list up front; ``concurrency``
+    pages then load round pages straight from those links, at most one
+    page load per ``delay`` seconds across the pool. A round that keeps
+    failing after ``retries`` retries is reported and skipped. Rounds are
+    returned in list order. With a ``manifest``, only rounds that are new
+    or changed in the list are loaded.
+    """
+    rounds = [r for r in await collect_round_links(page) if r['href']]
+    listed = len(rounds)
+    if manifest is not None:
+        pending = set(pending_items(manifest, 'rounds', {r['href']: round_listing(r) for r in rounds}))
+        rounds = [r for r in rounds if r['href'] in pending]
+    print(f"Found {listed} rounds, {len(rounds)} new or changed; scraping with {concurrency} pages")
+
+    queue = asyncio.Queue()
+    for i, round_info in enumerate(rounds):
+        queue.put_nowait((i, round_info))
+    results = [None] * len(rounds)
+    throttle = rate_limiter(delay)
+
+    async def worker(worker_page):
+        while True:
+            try:
+                i, round_info = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            for attempt in range(retries + 1):
+                await throttle()
+                try:
+                    await worker_page.goto(f"{FSX_URL}{round_info['href']}")
+                    await worker_page.wait_for_selector("table.hole-shots-table")
+                    shots_data = await extract_shots_data_async(worker_page)
+                    break
+                except Exception as e:
+                    if attempt == retries:
+                        print(f"Skipping round {i + 1} ({round_info['Date']}, {round_info['Course']}): {e}")
+                        shots_data = None
+            if shots_data is not None:
+                print(f"Scraped round {i + 1}/{len(rounds)} - Date: {round_info['Date']}, "
+                      f"Course: {round_info['Course']}, Score: {round_info['Score']}")
+                results[i] = {
+                    'Date': round_info['Date'],
+                    'Course': round_info['Course'],
+                    'Score': round_info['Score'],
+                    'Link': round_info['href'],
+                    'Shots': shots_data
+                }
+
+    pages = [page] + [await context.new_page() for _ in range(max(concurrency, 1) - 1)]
+    await asyncio.gather(*(worker(worker_page) for worker_page in pages))
+    return [r for r in results if r is not None]
+
+async def run_async(concurrency=SCRAPE_CONCURRENCY, delay=SCRAPE_DELAY, manifest=None):
+    """Sign in and scrape every new or changed round concurrently"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=False)
+        context = await browser.new_context()
+        page = await context.new_page()
+        await login_async(page)
+        rounds_data = await scrape_rounds_async(context, page, concurrency, delay, manifest=manifest)
+        await browser.close()
+    return rounds_data
+
+def run_sync(manifest=None):
+    """Sign in and scrape new or changed rounds one at a time through the round list"""
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=False)
+        page = browser.new_page()
+        login(page)
+
+        # Scrape the data from all rounds
+        rounds_data = scrape_rounds(page, manifest)
+
+        # Close the browser
+        browser.close()
+    return rounds_data
+
+def run_benchmark(runs=5):
+    """Sign in, open the first round and compare the two extraction paths"""
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=False)
+        page = browser.new_page()
+        login(page)
+
+        page.wait_for_selector("tr.row-link")
+        session_link = page.query_selector("tr.row-link").get_attribute("data-href")
+        page.goto(f"{FSX_URL}{session_link}")
+        page.wait_for_selector("table.hole-shots-table")
+        result = benchmark_extraction(page, runs)
+
+        browser.close()
+    return result
+
+def save_rounds(rounds_data, manifest, full=False):
+    """Merge scraped rounds into the raw and the formatted round exports
+
+    Rounds whose shots match the manifest are left alone; the others
+    replace their earlier rows or are appended. ``full`` rewrites the raw
+    export from ``rounds_data`` alone. Returns the number of rounds written.
+    """
     # Convert to DataFrame and save as CSV
     all_shots = []
+    changed = 0
     for round_data in rounds_data:
         date = round_data['Date']
         course = round_data['Course']
         score = round_data['Score']
+        link = round_data['Link']
         shots = round_data['Shots']
+        if not record_item(manifest, 'rounds', link, round_listing(round_data), shots, len(shots)):
+            continue
+        changed += 1
         for shot in shots:
             shot['Date'] = date
             shot['Course'] = course
             shot['Round Score'] = score
+            shot['Round Link'] = link
             all_shots.append(shot)
 
-    all_shots_df = pd.DataFrame(all_shots)
-    all_shots_df.to_csv("all_rounds_data.csv", index=False)
-
-    # Close the browser
-    browser.close()
-
-    print("Scraping complete. Data saved to all_rounds_data.csv")
+    if all_shots:
+        merge_rows(ROUNDS_EXPORT, pd.DataFrame(all_shots), 'Round Link', replace=full)
+
+        # Signed numeric copy for the rounds dashboard
+        os.makedirs("data", exist_ok=True)
+        convert_rounds_file(ROUNDS_EXPORT, FORMATTED_ROUNDS)
+    save_manifest(manifest)
+    return changed
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape FSX Live rounds")
+    parser.add_argument('--concurrency', type=int, default=SCRAPE_CONCURRENCY,
+                        help="round pages loaded at once")
+    parser.add_argument('--delay', type=float, default=SCRAPE_DELAY,
+                        help="least seconds between two page loads")
+    parser.add_argument('--sequential', action='store_true',
+                        help="click through the round list one round at a time")
+    parser.add_argument('--full', action='store_true',
+                        help="scrape every round, not just new or changed ones")
+    parser.add_argument('--benchmark-extraction', type=int, metavar='RUNS', nargs='?', const=5,
+                        help="time per-cell against batched extraction on the first round and exit")
+    args = parser.parse_args()
+
+    if args.benchmark_extraction:
+        result = run_benchmark(args.benchmark_extraction)
+        print(f"{result['shots']} shots: per-cell {result['per_cell_s']:.3f}s, "
+              f"batched {result['batched_s']:.3f}s "
+              f"({result['per_cell_s'] / max(result['batched_s'], 1e-9):.0f}x), "
+              f"identical: {result['identical']}")
+        return
+
+    if not args.full and not can_merge(ROUNDS_EXPORT, 'Round Link'):
+        parser.error(f"{ROUNDS_EXPORT} predates incremental scraping; run with --full to rebuild it")
+
+    manifest = load_manifest()
+    if args.full or not os.path.exists(ROUNDS_EXPORT):
+        # Without the export, rounds recorded in the manifest must be fetched again
+        manifest['rounds'] = {}
+
+    start = time.perf_counter()
+    if args.sequential:
+        rounds_data = run_sync(manifest)
+    else:
+        rounds_data = asyncio.run(run_async(args.concurrency, args.delay, manifest))
+    changed = save_rounds(rounds_data, manifest, args.full)
+
+    print(f"Scraping complete in {time.perf_counter() - start:.0f}s. {changed} new or changed rounds "
+          f"saved to {ROUNDS_EXPORT} and {FORMATTED_ROUNDS}")
+
+if __name__ == "__main__":
+    main()
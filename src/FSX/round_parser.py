@@ -0,0 +1,126 @@
+"""
+Vectorized parser for scraped FSX round exports.
+
+The round scraper stores shot metrics as the text shown on the page, e.g.
+``194.5                                yds``, ``"0.3°\\n    L"``,
+``829    R rpm`` or ``--``, next to the numeric hole table columns
+(``Carry (yds)``, ``Offline (yds)``). This module turns every metric into a
+signed float column named like the session CSVs (``Offline (yds L-/R+)``):
+L/R is folded into the sign (left negative) and ``--`` becomes NaN.
+
+Large exports are converted in streaming chunks:
+
+    python src/FSX/round_parser.py rounds/all_rounds_data.csv data/formatted_all_rounds_data.csv
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Shared data modules live at the project root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from units import parse_metric_column
+
+# Shot analysis label -> output column
+ROUND_METRICS = {
+    'Carry': 'Carry (yds)',
+    'Total Distance': 'Total Distance (yds)',
+    'Ball Speed': 'Ball Speed (mph)',
+    'Launch Angle': 'Launch Angle (deg)',
+    'Total Spin': 'Total Spin (rpm)',
+    'Push/Pull': 'Push/Pull (deg L-/R+)',
+    'Side Spin': 'Side Spin (rpm L-/R+)',
+    'Back Spin': 'Back Spin (rpm)',
+    'Descent Angle': 'Descent Angle (deg)',
+    'Peak Height': 'Peak Height (yds)',
+    'Offline': 'Offline (yds L-/R+)',
+    'Club Speed': 'Club Speed (mph)',
+    'Club Speed at Impact Location': 'Club Speed at Impact Location (mph)',
+    'Efficiency': 'Efficiency',
+    'Angle of Attack': 'Angle of Attack (deg)',
+    'Club Path': 'Club Path (deg out-in-/in-out+)',
+    'Face to Target': 'Face to Target (deg closed-/open+)',
+    'Lie': 'Lie (deg toe down-/toe up+)',
+    'Loft': 'Loft (deg)',
+    'Face Impact Horizontal': 'Face Impact Horizontal (mm toe-/heel+)',
+    'Face Impact Vertical': 'Face Impact Vertical (mm low-/high+)',
+    'Closure Rate': 'Closure Rate (deg/sec)',
+}
+
+# Hole table columns that duplicate a shot analysis metric; they fill gaps
+# when the analysis panel is missing
+TABLE_METRICS = {
+    'Carry (yds)': 'Carry (yds)',
+    'Total Distance (yds)': 'Total Distance (yds)',
+    'Offline (yds)': 'Offline (yds L-/R+)',
+}
+
+ROUND_COLUMNS = ['Shot Number', 'Club', 'Result']
+
+
+def parse_round_frame(df):
+    """Convert a raw round export frame to typed, deduplicated columns"""
+    out = pd.DataFrame(index=df.index)
+
+    # Shot Number stays text: penalty strokes are labelled e.g. 'Mulligan'
+    for col in ROUND_COLUMNS:
+        if col in df.columns:
+            out[col] = df[col]
+
+    for label, name in ROUND_METRICS.items():
+        if label in df.columns:
+            out[name] = parse_metric_column(df[label])
+        else:
+            out[name] = np.nan
+
+    for table_col, name in TABLE_METRICS.items():
+        if table_col in df.columns:
+            out[name] = out[name].fillna(parse_metric_column(df[table_col]))
+
+    if 'Date' in df.columns:
+        out['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%y', errors='coerce').dt.date
+    if 'Course' in df.columns:
+        out['Course'] = df['Course']
+    if 'Round Score' in df.columns:
+        out['Round Score'] = pd.to_numeric(df['Round Score'], errors='coerce')
+    if 'Round Link' in df.columns:
+        out['Round Link'] = df['Round Link']
+
+    return out
+
+
+def convert_rounds_file(src_path, dst_path, chunksize=50_000):
+    """Stream a raw round export through the parser into a formatted CSV
+
+    Only one chunk of raw text is held in memory at a time. Returns the
+    number of shots written.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(dst_path)), exist_ok=True)
+    tmp_path = dst_path + '.tmp'
+    rows = 0
+
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as out:
+        for i, chunk in enumerate(pd.read_csv(src_path, dtype=str, chunksize=chunksize)):
+            parsed = parse_round_frame(chunk)
+            parsed.to_csv(out, index=False, header=(i == 0))
+            rows += len(parsed)
+
+    os.replace(tmp_path, dst_path)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a scraped round export to signed numeric columns")
+    parser.add_argument('src', nargs='?', default='all_rounds_data.csv')
+    parser.add_argument('dst', nargs='?', default='data/formatted_all_rounds_data.csv')
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    args = parser.parse_args()
+
+    rows = convert_rounds_file(args.src, args.dst, args.chunksize)
+    print(f"Converted {rows} shots to {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,25 +20,50 @@ def login(page, username, password):
     page.wait_for_selector("div.navbar-container")
     print("Logged in successfully.")
 
+# Shot analysis labels kept for each shot, in column order
+SHOT_METRICS = [
+    "Carry", "Total Distance", "Ball Speed", "Launch Angle", "Total Spin", "Push/Pull",
+    "Side Spin", "Back Spin", "Descent Angle", "Peak Height", "Offline",
+]
+
+# Label -> value of every analysis item inside one shot element, read in the page
+READ_SHOT_METRICS = """
+shot => {
+    const metrics = {};
+    for (const item of shot.querySelectorAll('div.shot-analysis-item')) {
+        const label = item.querySelector('.shot-analysis-item-label');
+        const data = item.querySelector('.shot-analysis-item-data');
+        if (label && data) {
+            metrics[label.innerText.trim()] = data.innerText.trim();
+        }
+    }
+    return metrics;
+}
+"""
+
+def _keep_metrics(found, labels=SHOT_METRICS):
+    return {label: found[label] for label in labels if label in found}
+
 # Function to scrape the detailed metrics for each shot
 def scrape_metrics_for_shot(shot):
-    metrics = {}
+    """Metrics of one shot element in a single browser round trip
+
+    Labels missing from the shot are left out; the others are kept.
+    """
     try:
-        metrics["Carry"] = shot.query_selector("div.shot-analysis-item:has-text('Carry') .shot-analysis-item-data").inner_text().strip()
-        metrics["Total Distance"] = shot.query_selector("div.shot-analysis-item:has-text('Total Distance') .shot-analysis-item-data").inner_text().strip()
-        metrics["Ball Speed"] = shot.query_selector("div.shot-analysis-item:has-text('Ball Speed') .shot-analysis-item-data").inner_text().strip()
-        metrics["Launch Angle"] = shot.query_selector("div.shot-analysis-item:has-text('Launch Angle') .shot-analysis-item-data").inner_text().strip()
-        metrics["Total Spin"] = shot.query_selector("div.shot-analysis-item:has-text('Total Spin') .shot-analysis-item-data").inner_text().strip()
-        metrics["Push/Pull"] = shot.query_selector("div.shot-analysis-item:has-text('Push/Pull') .shot-analysis-item-data").inner_text().strip()
-        metrics["Side Spin"] = shot.query_selector("div.shot-analysis-item:has-text('Side Spin') .shot-analysis-item-data").inner_text().strip()
-        metrics["Back Spin"] = shot.query_selector("div.shot-analysis-item:has-text('Back Spin') .shot-analysis-item-data").inner_text().strip()
-        metrics["Descent Angle"] = shot.query_selector("div.shot-analysis-item:has-text('Descent Angle') .shot-analysis-item-data").inner_text().strip()
-        metrics["Peak Height"] = shot.query_selector("div.shot-analysis-item:has-text('Peak Height') .shot-analysis-item-data").inner_text().strip()
-        metrics["Offline"] = shot.query_selector("div.shot-analysis-item:has-text('Offline') .shot-analysis-item-data").inner_text().strip()
+        return _keep_metrics(shot.evaluate(READ_SHOT_METRICS))
     except Exception as e:
         print(f"Error scraping shot metrics: {e}")
-    
-    return metrics
+        return {}
+
+def extract_all_shot_metrics(page, selector=".shot-analysis-data", labels=SHOT_METRICS):
+    """Metrics of every shot on the page with one ``evaluate_all`` call
+
+    Returns one dict per shot element, in page order, holding the ``labels``
+    that shot has; a shot missing some labels keeps the ones it has.
+    """
+    shots = page.locator(selector).evaluate_all(f"shots => shots.map({READ_SHOT_METRICS})")
+    return [_keep_metrics(found, labels) for found in shots]
 
 # Function to scrape session data
 def scrape_session_data(page):
@@ -63,11 +88,11 @@ def scrape_session_data(page):
             # Wait for the shot analysis data to appear on the session details page
             page.wait_for_selector(".shot-analysis-data", timeout=30000)  # Wait for shot analysis data
             
-            # Scrape data for each shot in the session
-            shot_details = page.query_selector_all(".shot-analysis-data")
-            print(f"Found {len(shot_details)} shots in the session.")
-            
-            session_data = [scrape_metrics_for_shot(shot) for shot in shot_details]
+            # Scrape data for every shot in the session in one round trip
+            start = time.perf_counter()
+            session_data = extract_all_shot_metrics(page)
+            print(f"Found {len(session_data)} shots in the session "
+                  f"({time.perf_counter() - start:.2f}s to extract).")
             
             # Append the session data
             all_sessions_data.extend(session_data)
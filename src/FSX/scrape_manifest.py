@@ -0,0 +1,113 @@
+"""
+Persistent manifest of the FSX sessions and rounds already scraped.
+
+``data/fsx_manifest.json`` keeps one entry per SessionID (``sessions``) and
+per round link (``rounds``) with:
+
+- ``listing``: sha256 of the item's row on the list page. The list is read
+  on every run anyway, so a new or edited item is spotted without
+  fetching it.
+- ``sha256``: hash of the fetched content, so a re-fetch that returns the
+  same data leaves the combined export untouched.
+- ``rows`` and ``fetched``: rows stored and when.
+
+Scrapers read the list page, fetch only ``pending_items`` and hand the
+results to ``merge_rows``, which replaces the rows of changed items in the
+combined CSV and appends new ones instead of rewriting it from scratch.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+MANIFEST_PATH = os.path.join('data', 'fsx_manifest.json')
+MANIFEST_KINDS = ('sessions', 'rounds')
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the scrape manifest, empty when there is none"""
+    manifest = {kind: {} for kind in MANIFEST_KINDS}
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest.update(json.load(f))
+    return manifest
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Atomically write the scrape manifest"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def content_hash(content):
+    """sha256 of text, or of the canonical JSON of any other value"""
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def pending_items(manifest, kind, listings):
+    """Keys of ``listings`` that are new or whose list row changed
+
+    ``listings`` maps each item's key to what the list page shows for it.
+    """
+    entries = manifest[kind]
+    return [
+        key for key, listing in listings.items()
+        if key not in entries or entries[key]['listing'] != content_hash(listing)
+    ]
+
+
+def record_item(manifest, kind, key, listing, content, rows, sha256=None):
+    """Record a fetched item; returns whether its content changed
+
+    ``sha256`` is the content's hash when it was computed while streaming,
+    in which case ``content`` is not needed.
+    """
+    previous = manifest[kind].get(key)
+    sha256 = sha256 or content_hash(content)
+    manifest[kind][key] = {
+        'listing': content_hash(listing),
+        'sha256': sha256,
+        'rows': rows,
+        'fetched': datetime.now().isoformat(timespec='seconds'),
+    }
+    return previous is None or previous['sha256'] != sha256
+
+
+def can_merge(path, key_column):
+    """Whether ``merge_rows`` can merge into ``path``
+
+    False for a file written before the key column existed.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return True
+    return key_column in pd.read_csv(path, nrows=0).columns
+
+
+def merge_rows(path, new_rows, key_column, replace=False):
+    """Replace the rows of re-fetched items in a combined CSV and append new ones
+
+    Rows of ``path`` whose ``key_column`` appears in ``new_rows`` are
+    dropped before ``new_rows`` is appended; the file is replaced atomically.
+    ``replace`` writes ``new_rows`` alone. Raises ValueError rather than
+    lose rows when the file has no key column to merge on. Returns the
+    number of rows written.
+    """
+    combined = new_rows
+    if not replace and os.path.exists(path) and os.path.getsize(path) > 0:
+        if not can_merge(path, key_column):
+            raise ValueError(f"{path} has no '{key_column}' column to merge on")
+        existing = pd.read_csv(path, dtype=str)
+        existing = existing[~existing[key_column].isin(new_rows[key_column].astype(str))]
+        combined = pd.concat([existing, new_rows], ignore_index=True)
+
+    tmp_path = path + '.tmp'
+    combined.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return len(combined)
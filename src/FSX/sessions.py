@@ -1,52 +1,209 @@
-import os, io
+"""
+Export FSX Live range sessions.
+
+The Stats page lists the sessions; only those that are new or changed
+since the last run (see ``scrape_manifest``) are exported. Exports are
+downloaded ``--concurrency`` at a time with the browser's cookies and
+streamed line by line: lines that are not CSV (HTML or garbage) are
+dropped and the rest is written straight to
+``data/fsx_sessions/<SessionID>.csv``, so no session's text is held in
+memory. Non-200 responses are retried with exponential backoff.
+``all_sessions_exported.csv`` is then rebuilt from the per-session files in
+chunks.
+"""
+import argparse
+import csv
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
+import requests
 from playwright.sync_api import sync_playwright
 
-def download_and_clean_csv(context, session_id):
-    url = f"https://fsxlive.foresightsports.com/Stats/Export?sessionId={session_id}"
-    resp = context.request.get(url)
-    if resp.status != 200:
-        raise Exception(f"Export failed ({resp.status}): {session_id}")
-    text = resp.text()
-
-    # --- Clean out HTML or garbage lines ---
-    lines = text.splitlines()
-    csv_lines = []
-    for line in lines:
-        l = line.strip()
-        # keep lines that look like CSV (contain commas and no '<')
-        if "," in l and not l.startswith("<"):
-            csv_lines.append(l)
-    cleaned = "\n".join(csv_lines)
-
-    return cleaned
-
-with sync_playwright() as p:
-    browser = p.chromium.launch(headless=True)
-    context = browser.new_context(storage_state="auth_state.json")
-    page = context.new_page()
-
-    # Collect session IDs
+from scrape_manifest import load_manifest, pending_items, record_item, save_manifest
+
+EXPORT_FILE = "all_sessions_exported.csv"
+EXPORT_URL = "https://fsxlive.foresightsports.com/Stats/Export?sessionId={}"
+SESSION_STORE = os.path.join("data", "fsx_sessions")
+
+# Exports downloaded at once, retries of a failed export and the first
+# backoff in seconds (doubled on every retry)
+EXPORT_CONCURRENCY = int(os.environ.get('FSX_EXPORT_CONCURRENCY', 4))
+EXPORT_RETRIES = int(os.environ.get('FSX_EXPORT_RETRIES', 4))
+EXPORT_BACKOFF = float(os.environ.get('FSX_EXPORT_BACKOFF', 1.0))
+
+# Rows per chunk when combining the per-session files
+COMBINE_CHUNK_ROWS = 50_000
+
+def is_csv_line(line):
+    """Keep lines that look like CSV (contain commas and no '<')"""
+    return "," in line and not line.startswith("<")
+
+def session_path(session_id, store_dir=SESSION_STORE):
+    return os.path.join(store_dir, f"{session_id}.csv")
+
+_local = threading.local()
+
+def http_session(cookies):
+    """This thread's requests session, carrying the browser's cookies"""
+    http = getattr(_local, 'http', None)
+    if http is None:
+        http = _local.http = requests.Session()
+        for cookie in cookies:
+            http.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'])
+    return http
+
+def stream_session_export(cookies, session_id, store_dir=SESSION_STORE,
+                          retries=EXPORT_RETRIES, backoff=EXPORT_BACKOFF):
+    """Download one session export into its file in the store
+
+    Lines are filtered as they arrive and a SessionID column is appended,
+    after padding short rows to the header's width.
+    Returns the number of data rows and the sha256 of the kept lines.
+    Raises ValueError, leaving any earlier file in place, when the export
+    has no CSV header.
+    """
+    path = session_path(session_id, store_dir)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    for attempt in range(retries + 1):
+        try:
+            with http_session(cookies).get(EXPORT_URL.format(session_id), stream=True, timeout=60) as resp:
+                if resp.status_code != 200:
+                    raise requests.HTTPError(f"Export failed ({resp.status_code}): {session_id}")
+
+                digest = hashlib.sha256()
+                rows = -1  # the header is not a row
+                with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+                    writer = csv.writer(out, lineterminator='\n')
+                    for raw in resp.iter_lines():
+                        line = raw.decode('utf-8-sig', errors='replace').strip()
+                        if not is_csv_line(line):
+                            continue
+                        # Hash the kept lines joined by newlines, as the
+                        # manifest has always recorded them
+                        digest.update((b'\n' if rows >= 0 else b'') + line.encode('utf-8'))
+                        fields = next(csv.reader([line]))
+                        if rows < 0:
+                            width = len(fields)
+                            writer.writerow(fields + ['SessionID'])
+                        else:
+                            writer.writerow(fields + [''] * (width - len(fields)) + [session_id])
+                        rows += 1
+            if rows < 0:
+                raise ValueError(f"Export has no CSV data: {session_id}")
+            os.replace(tmp_path, path)
+            return max(rows, 0), digest.hexdigest()
+        except requests.RequestException as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            print(f"⚠️ {e}; retrying {session_id} in {delay:g}s")
+            time.sleep(delay)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+def combine_session_files(session_ids, out_path=EXPORT_FILE, store_dir=SESSION_STORE,
+                          chunk_rows=COMBINE_CHUNK_ROWS):
+    """Rebuild the combined export from per-session files, a chunk at a time
+
+    Sessions whose exports have different columns are aligned on the union
+    of them. Returns the number of rows written.
+    """
+    # An empty file has no header to read (left by an earlier empty export)
+    paths = [session_path(sid, store_dir) for sid in session_ids]
+    paths = [path for path in paths if os.path.exists(path) and os.path.getsize(path) > 0]
+    columns = []
+    for path in paths:
+        for col in pd.read_csv(path, nrows=0).columns:
+            if col not in columns:
+                columns.append(col)
+
+    rows = 0
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+        for path in paths:
+            # pandas will skip any malformed rows
+            for chunk in pd.read_csv(path, dtype=str, on_bad_lines='skip', chunksize=chunk_rows):
+                chunk.reindex(columns=columns).to_csv(out, index=False, header=(rows == 0))
+                rows += len(chunk)
+    os.replace(tmp_path, out_path)
+    return rows
+
+def list_sessions(page):
+    """SessionID -> text of its row on the Stats page"""
     page.goto("https://fsxlive.foresightsports.com/Stats")
     page.wait_for_selector("tr.row-link[data-href]")
-    session_ids = page.locator("tr.row-link[data-href]").evaluate_all(r"""
+    return dict(page.locator("tr.row-link[data-href]").evaluate_all(r"""
         rows => rows.map(r => {
             const qs = r.getAttribute('data-href').split('?')[1];
-            return new URLSearchParams(qs).get('SessionID');
+            return [new URLSearchParams(qs).get('SessionID'), r.textContent.replace(/\s+/g, ' ').trim()];
         })
-    """)
-
-    all_dfs = []
-    for sid in session_ids:
-        print(f"🔄 Exporting session {sid}")
-        csv_text = download_and_clean_csv(context, sid)
-        # pandas will skip any malformed rows
-        df = pd.read_csv(io.StringIO(csv_text), on_bad_lines='skip')
-        df["SessionID"] = sid
-        all_dfs.append(df)
-
-    combined = pd.concat(all_dfs, ignore_index=True)
-    combined.to_csv("all_sessions_exported.csv", index=False)
-    print("✅ All sessions exported to all_sessions_exported.csv")
-
-    browser.close()
+    """))
+
+def export_sessions(full=False, concurrency=EXPORT_CONCURRENCY, retries=EXPORT_RETRIES):
+    """Export the sessions that are new or changed since the last run
+
+    Only those sessions are downloaded, in parallel, into the session
+    store; EXPORT_FILE is then rebuilt from the store. ``full`` ignores the
+    manifest and downloads everything.
+    """
+    manifest = load_manifest()
+    if full:
+        manifest['sessions'] = {}
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context(storage_state="auth_state.json")
+        page = context.new_page()
+
+        # Collect session IDs
+        listings = list_sessions(page)
+        cookies = context.cookies()
+
+        browser.close()
+
+    pending = set(pending_items(manifest, 'sessions', listings))
+    pending |= {sid for sid in listings if not os.path.exists(session_path(sid))}
+    print(f"{len(pending)} of {len(listings)} sessions are new or changed")
+
+    os.makedirs(SESSION_STORE, exist_ok=True)
+    changed = 0
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        futures = {
+            pool.submit(stream_session_export, cookies, sid, retries=retries): sid
+            for sid in listings if sid in pending
+        }
+        for future in as_completed(futures):
+            sid = futures[future]
+            try:
+                rows, sha256 = future.result()
+            except Exception as e:
+                print(f"❌ Could not export session {sid}: {e}")
+                continue
+            print(f"🔄 Exported session {sid} ({rows} rows)")
+            changed += record_item(manifest, 'sessions', sid, listings[sid], None, rows, sha256=sha256)
+
+    if changed or not os.path.exists(EXPORT_FILE):
+        rows = combine_session_files(listings)
+        print(f"✅ {changed} sessions exported; {EXPORT_FILE} now has {rows} rows")
+    else:
+        print(f"✅ {EXPORT_FILE} is up to date")
+    save_manifest(manifest)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export FSX Live sessions")
+    parser.add_argument('--full', action='store_true',
+                        help="download every session, not just new or changed ones")
+    parser.add_argument('--concurrency', type=int, default=EXPORT_CONCURRENCY,
+                        help="exports downloaded at once")
+    parser.add_argument('--retries', type=int, default=EXPORT_RETRIES,
+                        help="retries of a failed export, with exponential backoff")
+    args = parser.parse_args()
+    export_sessions(args.full, args.concurrency, args.retries)
+
+if __name__ == "__main__":
+    main()
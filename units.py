@@ -0,0 +1,29 @@
+"""
+Parsing of metric values that carry units and direction as text.
+
+FSX exports and scraped pages write metrics the way they are displayed:
+``194.5   yds``, ``"0.3°\n   L"``, ``829   R rpm`` or ``--``.
+``parse_metric_column`` turns a column of those into signed floats with one
+compiled regex applied column-wise: L/R is folded into the sign (left
+negative), units are ignored and anything without a number is NaN.
+"""
+import re
+
+import pandas as pd
+
+# A number, an optional degree sign and an optional L/R direction, with any
+# whitespace or line breaks between them; units are ignored
+METRIC_RE = re.compile(r'(?P<value>[-+]?(?:\d+\.?\d*|\.\d+))\s*°?\s*(?P<side>[LR])?\b')
+
+SIDE_SIGNS = {'L': -1.0, 'R': 1.0}
+
+
+def parse_metric_column(series):
+    """Parse a column of metric text into signed floats"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+
+    parts = series.astype('string').str.extract(METRIC_RE)
+    values = pd.to_numeric(parts['value'], errors='coerce').astype(float)
+    signs = parts['side'].map(SIDE_SIGNS).astype(float).fillna(1.0)
+    return values * signs